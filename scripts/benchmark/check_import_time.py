@@ -0,0 +1,77 @@
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+
+# Ölçümler proje kökünde, her seferinde yeni bir Python process'inde (soğuk başlangıç) yapılır
+ROOT = Path(__file__).resolve().parents[2]
+
+# Veri ve analiz yolları: bu modüller görselleştirme kütüphanelerini yüklememeli
+DATA_MODULES = [
+    'src',
+    'src.utils',
+    'src.storage',
+    'src.data_loader',
+    'src.query',
+    'src.analyzer',
+    'src.cube',
+    'src.pipeline',
+    'src.cache',
+    'src.visualizer'
+]
+
+# Sadece bir görselleştirme fonksiyonu çağrıldığında yüklenmesi gereken paketler
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'plotly', 'sklearn', 'scipy']
+
+# Soğuk başlangıç bütçesi (saniye); pandas'ın kendi import süresi dahildir
+DEFAULT_BUDGET_SECONDS = 1.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+def measure_import(module, repeat=3):
+    """Modülü yeni process'lerde import et; en iyi süre ve yüklenen ağır paketler"""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                         cwd=ROOT, text=True)
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="src modüllerinin soğuk import süresi ve bütçe kontrolü")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Modül başına en fazla import süresi (saniye)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Her modül için ölçüm sayısı (en iyi süre alınır)")
+    parser.add_argument('--modules', nargs='+', default=DATA_MODULES,
+                        help="Ölçülecek modüller")
+    args = parser.parse_args()
+
+    print(f"⏱️  Soğuk import süreleri (bütçe {args.budget:.2f} s)")
+    failures = []
+    for module in args.modules:
+        result = measure_import(module, args.repeat)
+        over_budget = result['seconds'] > args.budget
+        flag = "❌" if over_budget or result['loaded'] else "✅"
+        loaded = f" ağır paketler: {', '.join(result['loaded'])}" if result['loaded'] else ""
+        print(f"{flag} {module:<20} {result['seconds']:>7.3f} s{loaded}")
+        if over_budget:
+            failures.append(f"{module}: {result['seconds']:.3f} s > {args.budget:.2f} s")
+        if result['loaded']:
+            failures.append(f"{module}: görselleştirme paketleri import sırasında yüklendi ({', '.join(result['loaded'])})")
+
+    if failures:
+        print("\n❌ Import bütçesi aşıldı:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+    print("\n✅ Tüm modüller import bütçesi içinde")
@@ -0,0 +1,196 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# src paketini ve veri üretim scriptlerini import edebilmek için
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts" / "data_generation"))
+
+from src.analyzer import FunnelAnalyzer, RFMAnalyzer, TrendAnalyzer
+from src.data_loader import load_raw_data
+from src.parallel import PartitionedFunnel
+from src.storage import convert_raw_to_columnar
+import create_funnel_data
+import create_processed_data
+
+DEFAULT_SCALES = [100_000, 1_000_000, 10_000_000]
+
+# Funnel üreticisi 366 günlük mevsimsel eğri kullanır; ortalama faktör ~1
+DAYS_PER_YEAR = 366
+
+def measure(func, repeat=1):
+    """
+    Fonksiyonu çalıştır; en iyi süre, tepe bellek (MB) ve son sonucu döndür.
+
+    tracemalloc her tahsisi yavaşlattığı için tepe bellek ayrı bir ilk
+    çalıştırmada ölçülür; süreler izleme kapalıyken yapılan repeat
+    çalıştırmanın en iyisidir. Tepe bellek Python ve NumPy/pandas
+    tahsislerini kapsar; pyarrow'un kendi bellek havuzu bu sayıya dahil değildir.
+    """
+    tracemalloc.start()
+    func()
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+
+    best_seconds = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+    return best_seconds, peak_mb, result
+
+def generate_data(workdir, rows):
+    """
+    Vektörel üreticilerle verilen ölçekte ham veri setlerini oluştur;
+    funnel tablosunun gerçek satır sayısını döndür.
+    """
+    raw_path = workdir / "data" / "raw"
+    raw_path.mkdir(parents=True, exist_ok=True)
+    (workdir / "data" / "processed").mkdir(parents=True, exist_ok=True)
+
+    base_visitors = max(1, rows // DAYS_PER_YEAR)
+    n_funnel = create_funnel_data.write_funnel_data_chunked(raw_path / "funnel_data.csv", base_visitors)
+    create_funnel_data.create_user_behavior_data_vectorized(rows).to_csv(raw_path / "user_behavior.csv",
+                                                                         index=False)
+    create_funnel_data.create_rfm_data_vectorized(rows).to_csv(raw_path / "rfm_data.csv", index=False)
+
+    # Satış verisi funnel/RFM/behavior analizlerinde kullanılmaz; küçük örnek yeterli
+    pd.DataFrame({'order_id': np.arange(1, 1001)}).to_csv(raw_path / "ecommerce_sales.csv", index=False)
+    return n_funnel
+
+def run_scale(rows, n_funnel, repeat):
+    """Bir ölçek için tüm benchmark'ları çalıştır; kayıt listesi döndür"""
+    records = []
+
+    def add_record(name, seconds, peak_mb, n_rows):
+        records.append({
+            'scale': rows,
+            'name': name,
+            'rows': int(n_rows),
+            'seconds': seconds,
+            'peak_mb': peak_mb,
+            'rows_per_sec': n_rows / seconds if seconds > 0 else None
+        })
+        peak = f"{peak_mb:>9.1f} MB" if peak_mb is not None else f"{'-':>12}"
+        print(f"   {name:<45} {seconds:>9.3f} s {peak}")
+
+    def record(name, func, n_rows):
+        seconds, peak_mb, result = measure(func, repeat)
+        add_record(name, seconds, peak_mb, n_rows)
+        return result
+
+    # Yükleme (tüm yükleme kayıtları funnel tablosunun satır sayısıyla raporlanır)
+    data = record('load_raw_data.csv', lambda: load_raw_data(use_store=False), n_funnel)
+    n_rfm = len(data['rfm'])
+    record('storage.convert_raw_to_columnar', lambda: convert_raw_to_columnar(force=True), n_funnel)
+    data = record('load_raw_data.store', lambda: load_raw_data(), n_funnel)
+    record('load_raw_data.store_compact', lambda: load_raw_data(compact=True), n_funnel)
+
+    # Analizörler (her ölçüm yeni instance ile, önbellek etkisi olmadan)
+    funnel_df = data['funnel']
+    for method in ['calculate_funnel_stages', 'calculate_conversion_rates', 'find_bottleneck']:
+        record(f'FunnelAnalyzer.{method}', lambda: getattr(FunnelAnalyzer(funnel_df), method)(), n_funnel)
+
+    rfm_df = data['rfm']
+    for method in ['calculate_rfm_scores', 'get_segment_summary']:
+        record(f'RFMAnalyzer.{method}', lambda: getattr(RFMAnalyzer(rfm_df), method)(), n_rfm)
+
+    for method in ['calculate_daily_trends', 'calculate_weekly_trends', 'calculate_monthly_trends']:
+        record(f'TrendAnalyzer.{method}', lambda: getattr(TrendAnalyzer(funnel_df), method)(), n_funnel)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        record(f'PartitionedFunnel.from_frame[{workers}]',
+               lambda: PartitionedFunnel.from_frame(funnel_df, workers=workers), n_funnel)
+
+    # create_processed_data.py: tüm pipeline tek thread'de; adım süreleri Pipeline.timings'ten
+    # (her adımın tekrarlar içindeki en iyi süresi, tepe bellek sadece pipeline geneli için)
+    pipeline = create_processed_data.build_pipeline()
+    step_seconds = {}
+
+    def run_pipeline():
+        pipeline.run(create_processed_data.OUTPUT_STEPS)
+        for step, seconds in pipeline.timings.items():
+            step_seconds[step] = min(seconds, step_seconds.get(step, float('inf')))
+
+    record('create_processed_data.pipeline', run_pipeline, n_funnel)
+    for step, seconds in step_seconds.items():
+        add_record(f'create_processed_data.{step}', seconds, None, n_funnel)
+
+    return records
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    """Sonuçları önceki bir çalıştırmayla karşılaştır (süre oranı)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['scale'], r['name']): r for r in json.load(f)['results']}
+
+    print(f"\n📊 Karşılaştırma: {baseline_path}")
+    for r in results:
+        base = baseline.get((r['scale'], r['name']))
+        if base is None:
+            continue
+        ratio = r['seconds'] / base['seconds'] if base['seconds'] > 0 else float('nan')
+        flag = "⚠️" if ratio > 1.1 else "  "
+        print(f"{flag} {r['scale']:>10} {r['name']:<45} {base['seconds']:>9.3f} s -> {r['seconds']:>9.3f} s (x{ratio:.2f})")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Analyzer, loader ve processed-data pipeline benchmark'ları")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Satır sayısı ölçekleri")
+    parser.add_argument('--workdir', default='benchmark_data',
+                        help="Sentetik verinin yazılacağı dizin")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="Sonuç dosyası (JSON)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Her ölçüm için tekrar sayısı (en iyi süre alınır)")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve()
+    compare_path = Path(args.compare).resolve() if args.compare else None
+    cwd = Path.cwd()
+
+    all_results = []
+    for rows in args.scales:
+        workdir = Path(args.workdir).resolve() / f"scale_{rows}"
+        print(f"\n🔄 Ölçek {rows:,}: veri oluşturuluyor ({workdir})")
+        n_funnel = generate_data(workdir, rows)
+
+        # Modüller data/raw ve data/processed yollarını göreli kullanır
+        os.chdir(workdir)
+        try:
+            all_results.extend(run_scale(rows, n_funnel, args.repeat))
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'results': all_results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Sonuçlar kaydedildi: {output}")
+
+    if compare_path:
+        compare(all_results, compare_path)
@@ -2,6 +2,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
+import pyarrow as pa
+import pyarrow.compute as pc
+from pathlib import Path
+import sys
+
+# src paketini import edebilmek için proje kök dizini
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.rfm_store import RFM_SEGMENTS, classify_segments
 
 # Funnel analizi için veri oluştur
 np.random.seed(42)
@@ -11,6 +20,16 @@ random.seed(42)
 start_date = datetime(2024, 1, 1)
 end_date = datetime(2024, 12, 31)
 
+# Kategorik değerler (vektörel üretici de aynı listeleri kullanır)
+CATEGORIES = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Spor', 'Kitap', 'Kozmetik']
+DEVICES = ['Desktop', 'Mobile', 'Tablet']
+SOURCES = ['Google', 'Direct', 'Social Media', 'Email', 'Referral']
+
+# Funnel aşama olasılıkları (bir önceki aşamaya koşullu)
+ADD_TO_CART_P = 0.3
+START_CHECKOUT_P = 0.6
+COMPLETE_PURCHASE_P = 0.8
+
 # Funnel verisi oluştur
 def create_funnel_data():
     # Ana funnel verisi
@@ -29,9 +48,9 @@ def create_funnel_data():
     }
     
     # Kategoriler
-    categories = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Spor', 'Kitap', 'Kozmetik']
-    devices = ['Desktop', 'Mobile', 'Tablet']
-    sources = ['Google', 'Direct', 'Social Media', 'Email', 'Referral']
+    categories = CATEGORIES
+    devices = DEVICES
+    sources = SOURCES
     
     # Her gün için veri oluştur
     current_date = start_date
@@ -46,9 +65,9 @@ def create_funnel_data():
         for _ in range(daily_visitors):
             # Funnel aşamaları
             page_view = 1
-            add_to_cart = np.random.choice([0, 1], p=[0.7, 0.3])  # %30 sepet ekleme
-            start_checkout = add_to_cart * np.random.choice([0, 1], p=[0.4, 0.6])  # %60 ödeme başlatma
-            complete_purchase = start_checkout * np.random.choice([0, 1], p=[0.2, 0.8])  # %80 tamamlama
+            add_to_cart = np.random.choice([0, 1], p=[1 - ADD_TO_CART_P, ADD_TO_CART_P])  # %30 sepet ekleme
+            start_checkout = add_to_cart * np.random.choice([0, 1], p=[1 - START_CHECKOUT_P, START_CHECKOUT_P])  # %60 ödeme başlatma
+            complete_purchase = start_checkout * np.random.choice([0, 1], p=[1 - COMPLETE_PURCHASE_P, COMPLETE_PURCHASE_P])  # %80 tamamlama
             
             # Veri ekle
             funnel_data['date'].append(current_date)
@@ -69,8 +88,75 @@ def create_funnel_data():
     
     return pd.DataFrame(funnel_data)
 
+# Vektörel funnel üretici: büyük veri setleri için
+def daily_visitor_counts(base_visitors=1000):
+    """Her gün için ziyaretçi sayısını aynı mevsimsel sin eğrisiyle hesapla"""
+    dates = pd.date_range(start_date, end_date, freq='D')
+    seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * dates.dayofyear.to_numpy() / 365)
+    counts = (base_visitors * seasonal_factor).astype(np.int64)
+    return dates, counts
+
+def iter_funnel_chunks(base_visitors=1000, chunk_rows=1_000_000, seed=42):
+    """
+    Funnel session'larını NumPy dizileriyle toplu olarak üret ve
+    en fazla chunk_rows satırlık DataFrame parçaları halinde döndür.
+
+    Bellek kullanımı toplam satır sayısından bağımsızdır; sadece chunk_rows
+    ile orantılıdır. Sütunlar ve sıralama create_funnel_data ile aynıdır.
+    """
+    rng = np.random.default_rng(seed)
+    dates, counts = daily_visitor_counts(base_visitors)
+    day_ends = np.cumsum(counts)
+    total_rows = int(day_ends[-1])
+
+    # Sabit etiket tabloları; satırlar sadece tamsayı kod taşır
+    user_labels = pd.Index([f"user_{i}" for i in range(1000, 10000)])
+    product_labels = pd.Index([f"prod_{i}" for i in range(100, 1000)])
+    category_labels = pd.Index(CATEGORIES)
+    device_labels = pd.Index(DEVICES)
+    source_labels = pd.Index(SOURCES)
+
+    for start in range(0, total_rows, chunk_rows):
+        stop = min(start + chunk_rows, total_rows)
+        n = stop - start
+        row_index = np.arange(start, stop, dtype=np.int64)
+
+        # Her satırın ait olduğu gün
+        day_index = np.searchsorted(day_ends, row_index, side='right')
+
+        # Bernoulli aşama çekilişleri (koşullu olasılıklar korunur)
+        add_to_cart = rng.random(n) < ADD_TO_CART_P
+        start_checkout = add_to_cart & (rng.random(n) < START_CHECKOUT_P)
+        complete_purchase = start_checkout & (rng.random(n) < COMPLETE_PURCHASE_P)
+
+        yield pd.DataFrame({
+            'date': dates[day_index],
+            'page_view': np.ones(n, dtype=np.int8),
+            'add_to_cart': add_to_cart.astype(np.int8),
+            'start_checkout': start_checkout.astype(np.int8),
+            'complete_purchase': complete_purchase.astype(np.int8),
+            'session_id': row_index + 1,
+            'user_id': pd.Categorical.from_codes(rng.integers(0, len(user_labels), n), categories=user_labels),
+            'product_id': pd.Categorical.from_codes(rng.integers(0, len(product_labels), n), categories=product_labels),
+            'category': pd.Categorical.from_codes(rng.integers(0, len(category_labels), n), categories=category_labels),
+            'device_type': pd.Categorical.from_codes(rng.integers(0, len(device_labels), n), categories=device_labels),
+            'source': pd.Categorical.from_codes(rng.integers(0, len(source_labels), n), categories=source_labels)
+        })
+
+def create_funnel_data_vectorized(base_visitors=1000, seed=42):
+    """Vektörel üreticiyle tüm funnel verisini tek DataFrame olarak oluştur"""
+    return pd.concat(list(iter_funnel_chunks(base_visitors, seed=seed)), ignore_index=True)
+
+def write_funnel_data_chunked(path, base_visitors=1000, chunk_rows=1_000_000, seed=42):
+    """Funnel verisini parça parça CSV'ye yaz; toplam satır sayısını döndür"""
+    total_rows = 0
+    for i, chunk in enumerate(iter_funnel_chunks(base_visitors, chunk_rows, seed)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        total_rows += len(chunk)
+    return total_rows
+
 # Kullanıcı davranış verisi
-def create_user_behavior_data():
+def create_user_behavior_data(n_sessions=1000):
     behavior_data = {
         'session_id': [],
         'user_id': [],
@@ -82,8 +168,8 @@ def create_user_behavior_data():
         'date': []
     }
     
-    # 1000 session için veri
-    for i in range(1000):
+    # 1000 session için veri (varsayılan)
+    for i in range(n_sessions):
         session_duration = np.random.exponential(300)  # ortalama 5 dakika
         pages_viewed = np.random.poisson(8)  # ortalama 8 sayfa
         bounce_rate = np.random.beta(2, 8)  # düşük bounce rate
@@ -101,8 +187,29 @@ def create_user_behavior_data():
     
     return pd.DataFrame(behavior_data)
 
+def create_user_behavior_data_vectorized(n_sessions=1000, seed=42):
+    """create_user_behavior_data ile aynı kolonlar ve dağılımlar, döngüsüz"""
+    rng = np.random.default_rng(seed)
+    return_visitor = (rng.random(n_sessions) < 0.3).astype(np.int64)
+    purchase_value = np.where(return_visitor == 1, rng.exponential(150, n_sessions), 0.0)
+
+    # Kimlik metinleri Arrow ile tek seferde üretilir (Python string döngüsü olmadan)
+    session_numbers = pa.array(np.arange(1, n_sessions + 1)).cast(pa.string())
+    user_numbers = pa.array(rng.integers(1000, 10000, n_sessions)).cast(pa.string())
+
+    return pd.DataFrame({
+        'session_id': pc.binary_join_element_wise('session_', session_numbers, '').to_pandas(),
+        'user_id': pc.binary_join_element_wise('user_', user_numbers, '').to_pandas(),
+        'session_duration': rng.exponential(300, n_sessions),  # ortalama 5 dakika
+        'pages_viewed': rng.poisson(8, n_sessions),  # ortalama 8 sayfa
+        'bounce_rate': rng.beta(2, 8, n_sessions),  # düşük bounce rate
+        'return_visitor': return_visitor,
+        'purchase_value': purchase_value,
+        'date': np.datetime64(start_date.date()) + rng.integers(0, 366, n_sessions).astype('timedelta64[D]')
+    })
+
 # RFM analizi için veri
-def create_rfm_data():
+def create_rfm_data(n_customers=500):
     rfm_data = {
         'customer_id': [],
         'recency_days': [],
@@ -112,8 +219,8 @@ def create_rfm_data():
         'last_purchase_date': []
     }
     
-    # 500 müşteri için RFM verisi
-    for i in range(500):
+    # 500 müşteri için RFM verisi (varsayılan)
+    for i in range(n_customers):
         recency = np.random.exponential(30)  # ortalama 30 gün
         frequency = np.random.poisson(3) + 1  # en az 1 alışveriş
         monetary = np.random.exponential(200)  # ortalama 200 TL
@@ -137,23 +244,66 @@ def create_rfm_data():
     
     return pd.DataFrame(rfm_data)
 
+# Vektörel RFM üretici: milyonlarca müşteri için
+def create_rfm_data_vectorized(n_customers=500, seed=42):
+    """create_rfm_data ile aynı dağılımlar ve segment kuralları, döngüsüz"""
+    rng = np.random.default_rng(seed)
+    recency = rng.exponential(30, n_customers)  # ortalama 30 gün
+    frequency = rng.poisson(3, n_customers) + 1  # en az 1 alışveriş
+    monetary = rng.exponential(200, n_customers)  # ortalama 200 TL
+
+    # RFM segmentasyonu: RFM deposuyla ortak kurallar (if/elif zinciriyle aynı öncelik sırası)
+    segment_codes = classify_segments(recency, frequency, monetary)
+
+    # Kimlik metinleri Arrow ile tek seferde üretilir (Python string döngüsü olmadan)
+    customer_numbers = pa.array(np.arange(1, n_customers + 1)).cast(pa.string())
+    customer_ids = pc.binary_join_element_wise('customer_', customer_numbers, '').to_pandas()
+
+    recency_days = recency.astype(np.int64)
+    return pd.DataFrame({
+        'customer_id': customer_ids,
+        'recency_days': recency_days,
+        'frequency': frequency,
+        'monetary': monetary,
+        'segment': pd.Categorical.from_codes(segment_codes, categories=RFM_SEGMENTS),
+        'last_purchase_date': np.datetime64(end_date.date()) - recency_days.astype('timedelta64[D]')
+    })
+
 # Veri setlerini oluştur ve kaydet
-print("Funnel analizi veri setleri oluşturuluyor...")
+if __name__ == '__main__':
+    import argparse
 
-# Ana funnel verisi
-funnel_df = create_funnel_data()
-funnel_df.to_csv('data/raw/funnel_data.csv', index=False)
-print(f"Funnel verisi oluşturuldu: {len(funnel_df)} kayıt")
+    parser = argparse.ArgumentParser(description="Funnel analizi veri setlerini oluştur")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="Funnel verisini vektörel üreticiyle parça parça yaz")
+    parser.add_argument('--base-visitors', type=int, default=1000,
+                        help="Günlük temel ziyaretçi sayısı (vektörel mod)")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000,
+                        help="Her CSV parçasındaki satır sayısı (vektörel mod)")
+    parser.add_argument('--customers', type=int, default=500,
+                        help="RFM müşteri sayısı (vektörel mod)")
+    args = parser.parse_args()
 
-# Kullanıcı davranış verisi
-behavior_df = create_user_behavior_data()
-behavior_df.to_csv('data/raw/user_behavior.csv', index=False)
-print(f"Kullanıcı davranış verisi oluşturuldu: {len(behavior_df)} kayıt")
+    print("Funnel analizi veri setleri oluşturuluyor...")
+
+    # Ana funnel verisi
+    if args.vectorized:
+        n_rows = write_funnel_data_chunked('data/raw/funnel_data.csv', args.base_visitors, args.chunk_rows)
+    else:
+        funnel_df = create_funnel_data()
+        funnel_df.to_csv('data/raw/funnel_data.csv', index=False)
+        n_rows = len(funnel_df)
+    print(f"Funnel verisi oluşturuldu: {n_rows} kayıt")
+
+    # Kullanıcı davranış verisi
+    behavior_df = create_user_behavior_data_vectorized() if args.vectorized else create_user_behavior_data()
+    behavior_df.to_csv('data/raw/user_behavior.csv', index=False)
+    print(f"Kullanıcı davranış verisi oluşturuldu: {len(behavior_df)} kayıt")
 
-# RFM verisi
-rfm_df = create_rfm_data()
-rfm_df.to_csv('data/raw/rfm_data.csv', index=False)
-print(f"RFM verisi oluşturuldu: {len(rfm_df)} kayıt")
+    # RFM verisi
+    rfm_df = create_rfm_data_vectorized(args.customers) if args.vectorized else create_rfm_data()
+    rfm_df.to_csv('data/raw/rfm_data.csv', index=False)
+    print(f"RFM verisi oluşturuldu: {len(rfm_df)} kayıt")
 
-print("\n✅ Tüm veri setleri başarıyla oluşturuldu!")
-print("📊 Funnel analizi için hazır!") 
\ No newline at end of file
+    print("\n✅ Tüm veri setleri başarıyla oluşturuldu!")
+    print("📊 Funnel analizi için hazır!") 
\ No newline at end of file
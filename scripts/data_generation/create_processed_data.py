@@ -1,117 +1,116 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from pathlib import Path
 import json
+import sys
 
-print("🔄 Processed veri setleri oluşturuluyor...")
+# src paketini import edebilmek için proje kök dizini
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analyzer import RFMAnalyzer, summarize_groups
+from src.cache import ResultCache, source_version
+from src.cube import FunnelCube, DIMENSIONS
+from src.data_loader import load_raw_data
+from src.pipeline import Pipeline
+from src.query import scan
+from src.storage import dataset_source
+
+STAGES = ['page_view', 'add_to_cart', 'start_checkout', 'complete_purchase']
+
+# 0. Ham veri setleri (her biri tek sefer yüklenir)
+def load_funnel_raw():
+    return scan('funnel').select(*DIMENSIONS, *STAGES).collect()
+
+def load_behavior_raw():
+    return load_raw_data(['behavior'])['behavior']
+
+def load_rfm_raw():
+    return load_raw_data(['rfm'])['rfm']
 
 # 1. Funnel analizi için işlenmiş veri
-def create_processed_funnel_data():
-    # Raw funnel verisini yükle
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    funnel_df['date'] = pd.to_datetime(funnel_df['date'])
-    
+def build_funnel_cube(funnel_df):
+    # Ham tablonun tek taraması; diğer tüm funnel özetleri küpten roll-up ile türetilir
+    return FunnelCube.from_frame(funnel_df)
+
+def save_funnel_cube(cube):
+    cube.save('data/processed/funnel_cube.parquet')
+    print(f"✅ Funnel küpü oluşturuldu: {len(cube.table)} hücre")
+
+def build_date_category_funnel(cube):
+    # Tarih x kategori funnel'i
+    date_category = cube.rollup(['date', 'category'])[['date', 'category'] + STAGES]
+    date_category['category'] = date_category['category'].astype(str)
+    return date_category.sort_values(['date', 'category']).reset_index(drop=True)
+
+def build_daily_funnel(date_category):
     # Günlük funnel özeti
-    daily_funnel = funnel_df.groupby('date').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum', 
-        'start_checkout': 'sum',
-        'complete_purchase': 'sum'
-    }).reset_index()
-    
+    daily_funnel = date_category.groupby('date')[STAGES].sum().reset_index()
+
     # Conversion rate'leri hesapla
     daily_funnel['cart_conversion_rate'] = (daily_funnel['add_to_cart'] / daily_funnel['page_view']) * 100
     daily_funnel['checkout_conversion_rate'] = (daily_funnel['start_checkout'] / daily_funnel['add_to_cart']) * 100
     daily_funnel['purchase_conversion_rate'] = (daily_funnel['complete_purchase'] / daily_funnel['start_checkout']) * 100
     daily_funnel['overall_conversion_rate'] = (daily_funnel['complete_purchase'] / daily_funnel['page_view']) * 100
-    
-    # Haftalık ve aylık özetler
+
+    # Haftalık ve aylık özetler için anahtarlar
     daily_funnel['week'] = daily_funnel['date'].dt.isocalendar().week
     daily_funnel['month'] = daily_funnel['date'].dt.month
-    
-    weekly_funnel = daily_funnel.groupby('week').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum',
-        'start_checkout': 'sum', 
-        'complete_purchase': 'sum',
-        'overall_conversion_rate': 'mean'
-    }).reset_index()
-    
-    monthly_funnel = daily_funnel.groupby('month').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum',
-        'start_checkout': 'sum',
-        'complete_purchase': 'sum', 
-        'overall_conversion_rate': 'mean'
-    }).reset_index()
-    
+    return daily_funnel
+
+def build_period_funnel(daily_funnel, period):
+    # Dönem oranı günlük oranların ortalaması değil, dönem toplamlarının oranıdır
+    period_funnel = daily_funnel.groupby(period)[STAGES].sum().reset_index()
+    period_funnel['overall_conversion_rate'] = (period_funnel['complete_purchase'] / period_funnel['page_view']) * 100
+    return period_funnel
+
+def build_category_funnel(date_category):
     # Kategori bazlı funnel
-    category_funnel = funnel_df.groupby('category').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum',
-        'start_checkout': 'sum',
-        'complete_purchase': 'sum'
-    }).reset_index()
-    
+    category_funnel = date_category.groupby('category')[STAGES].sum().reset_index()
     category_funnel['conversion_rate'] = (category_funnel['complete_purchase'] / category_funnel['page_view']) * 100
-    
-    # Kaydet
+    return category_funnel
+
+def save_funnel_data(daily_funnel, weekly_funnel, monthly_funnel, category_funnel):
     daily_funnel.to_csv('data/processed/daily_funnel_summary.csv', index=False)
     weekly_funnel.to_csv('data/processed/weekly_funnel_summary.csv', index=False)
     monthly_funnel.to_csv('data/processed/monthly_funnel_summary.csv', index=False)
     category_funnel.to_csv('data/processed/category_funnel_summary.csv', index=False)
-    
+
     print(f"✅ Funnel processed verileri oluşturuldu:")
     print(f"   - Daily summary: {len(daily_funnel)} kayıt")
-    print(f"   - Weekly summary: {len(weekly_funnel)} kayıt") 
+    print(f"   - Weekly summary: {len(weekly_funnel)} kayıt")
     print(f"   - Monthly summary: {len(monthly_funnel)} kayıt")
     print(f"   - Category summary: {len(category_funnel)} kayıt")
 
 # 2. RFM analizi için işlenmiş veri
-def create_processed_rfm_data():
-    rfm_df = pd.read_csv('data/raw/rfm_data.csv')
-    
-    # RFM skorları hesapla
-    rfm_df['R_score'] = pd.qcut(rfm_df['recency_days'], q=4, labels=[4, 3, 2, 1])
-    rfm_df['F_score'] = pd.qcut(rfm_df['frequency'], q=4, labels=[1, 2, 3, 4])
-    rfm_df['M_score'] = pd.qcut(rfm_df['monetary'], q=4, labels=[1, 2, 3, 4])
-    
-    # RFM skorunu birleştir
-    rfm_df['RFM_score'] = rfm_df['R_score'].astype(str) + rfm_df['F_score'].astype(str) + rfm_df['M_score'].astype(str)
-    
-    # Segment bazlı özet
-    segment_summary = rfm_df.groupby('segment').agg({
-        'customer_id': 'count',
-        'recency_days': 'mean',
-        'frequency': 'mean', 
-        'monetary': ['mean', 'sum']
-    }).round(2)
-    
-    # Multi-level columns'ı düzelt
-    segment_summary.columns = ['customer_count', 'avg_recency', 'avg_frequency', 'avg_monetary', 'total_monetary']
+def create_processed_rfm_data(rfm_df):
+    # RFM skorları hesapla (tamsayı kodlu, vektörel)
+    rfm_df = RFMAnalyzer(rfm_df).calculate_rfm_scores()
+
+    # Segment bazlı özet (tek geçişte, düz kolonlar)
+    segment_summary = summarize_groups(rfm_df, 'segment').round(2)
     segment_summary['percentage'] = (segment_summary['customer_count'] / len(rfm_df)) * 100
-    
+
     # RFM skor bazlı özet
-    rfm_score_summary = rfm_df.groupby('RFM_score').agg({
-        'customer_id': 'count',
-        'monetary': 'sum'
+    rfm_score_summary = summarize_groups(rfm_df, 'RFM_score', {
+        'customer_id': ('customer_id', 'count'),
+        'monetary': ('monetary', 'sum')
     }).reset_index()
-    
+
     # Kaydet
     rfm_df.to_csv('data/processed/rfm_scored.csv', index=False)
     segment_summary.to_csv('data/processed/rfm_segment_summary.csv')
     rfm_score_summary.to_csv('data/processed/rfm_score_summary.csv', index=False)
-    
+
     print(f"✅ RFM processed verileri oluşturuldu:")
     print(f"   - Scored RFM: {len(rfm_df)} kayıt")
     print(f"   - Segment summary: {len(segment_summary)} segment")
     print(f"   - Score summary: {len(rfm_score_summary)} skor")
 
 # 3. Kullanıcı davranışı için işlenmiş veri
-def create_processed_behavior_data():
-    behavior_df = pd.read_csv('data/raw/user_behavior.csv')
-    behavior_df['date'] = pd.to_datetime(behavior_df['date'])
-    
+def create_processed_behavior_data(behavior_df):
+    behavior_df = behavior_df.copy()
+
     # Session analizi özeti
     session_summary = behavior_df.groupby('return_visitor').agg({
         'session_id': 'count',
@@ -120,7 +119,7 @@ def create_processed_behavior_data():
         'bounce_rate': 'mean',
         'purchase_value': 'mean'
     }).round(2)
-    
+
     # Günlük davranış özeti
     daily_behavior = behavior_df.groupby('date').agg({
         'session_id': 'count',
@@ -130,57 +129,52 @@ def create_processed_behavior_data():
         'return_visitor': 'mean',
         'purchase_value': 'sum'
     }).reset_index()
-    
+
     # Kullanıcı segmentasyonu
-    behavior_df['session_category'] = pd.cut(behavior_df['session_duration'], 
+    behavior_df['session_category'] = pd.cut(behavior_df['session_duration'],
                                            bins=[0, 300, 600, 1200, float('inf')],
                                            labels=['Short', 'Medium', 'Long', 'Very Long'])
-    
-    session_category_summary = behavior_df.groupby('session_category').agg({
+
+    session_category_summary = behavior_df.groupby('session_category', observed=False).agg({
         'session_id': 'count',
         'purchase_value': 'mean',
         'return_visitor': 'mean'
     }).round(2)
-    
+
     # Kaydet
     session_summary.to_csv('data/processed/session_summary.csv')
     daily_behavior.to_csv('data/processed/daily_behavior_summary.csv', index=False)
     session_category_summary.to_csv('data/processed/session_category_summary.csv')
-    
+
     print(f"✅ Behavior processed verileri oluşturuldu:")
     print(f"   - Session summary: {len(session_summary)} kategori")
     print(f"   - Daily behavior: {len(daily_behavior)} gün")
     print(f"   - Session category: {len(session_category_summary)} kategori")
 
 # 4. KPI dashboard için özet veri
-def create_kpi_dashboard_data():
-    # Ana KPI'ları hesapla
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    behavior_df = pd.read_csv('data/raw/user_behavior.csv')
-    rfm_df = pd.read_csv('data/raw/rfm_data.csv')
-    
-    # Funnel KPI'ları
-    total_views = funnel_df['page_view'].sum()
-    total_cart_adds = funnel_df['add_to_cart'].sum()
-    total_checkouts = funnel_df['start_checkout'].sum()
-    total_purchases = funnel_df['complete_purchase'].sum()
-    
+def create_kpi_dashboard_data(daily_funnel, behavior_df, rfm_df):
+    # Funnel KPI'ları (günlük özetin toplamı ham tablonun toplamına eşittir)
+    total_views = daily_funnel['page_view'].sum()
+    total_cart_adds = daily_funnel['add_to_cart'].sum()
+    total_checkouts = daily_funnel['start_checkout'].sum()
+    total_purchases = daily_funnel['complete_purchase'].sum()
+
     overall_conversion = (total_purchases / total_views) * 100
     cart_conversion = (total_cart_adds / total_views) * 100
     checkout_conversion = (total_checkouts / total_cart_adds) * 100
     purchase_conversion = (total_purchases / total_checkouts) * 100
-    
+
     # Behavior KPI'ları
     avg_session_duration = behavior_df['session_duration'].mean() / 60  # dakika
     avg_pages_viewed = behavior_df['pages_viewed'].mean()
     avg_bounce_rate = behavior_df['bounce_rate'].mean() * 100
     return_visitor_rate = behavior_df['return_visitor'].mean() * 100
-    
+
     # RFM KPI'ları
     avg_order_value = rfm_df['monetary'].mean()
     customer_lifetime_value = avg_order_value * rfm_df['frequency'].mean()
     champions_percentage = (rfm_df[rfm_df['segment'] == 'Champions']['monetary'].sum() / rfm_df['monetary'].sum()) * 100
-    
+
     # KPI dashboard verisi
     kpi_data = {
         'metric': [
@@ -202,72 +196,130 @@ def create_kpi_dashboard_data():
             'TL', 'TL', '%'
         ]
     }
-    
+
     kpi_df = pd.DataFrame(kpi_data)
     kpi_df.to_csv('data/processed/kpi_dashboard.csv', index=False)
-    
+
     print(f"✅ KPI dashboard verisi oluşturuldu: {len(kpi_df)} metrik")
 
 # 5. Trend analizi için işlenmiş veri
-def create_trend_analysis_data():
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    funnel_df['date'] = pd.to_datetime(funnel_df['date'])
-    
-    # Günlük trend
-    daily_trend = funnel_df.groupby('date').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum',
-        'start_checkout': 'sum',
-        'complete_purchase': 'sum'
-    }).reset_index()
-    
-    daily_trend['conversion_rate'] = (daily_trend['complete_purchase'] / daily_trend['page_view']) * 100
-    
-    # Haftalık trend
-    daily_trend['week'] = daily_trend['date'].dt.isocalendar().week
-    weekly_trend = daily_trend.groupby('week').agg({
-        'page_view': 'sum',
-        'complete_purchase': 'sum',
-        'conversion_rate': 'mean'
-    }).reset_index()
-    
-    # Aylık trend
-    daily_trend['month'] = daily_trend['date'].dt.month
-    monthly_trend = daily_trend.groupby('month').agg({
-        'page_view': 'sum',
-        'complete_purchase': 'sum', 
-        'conversion_rate': 'mean'
-    }).reset_index()
-    
+def create_trend_analysis_data(daily_funnel, weekly_funnel, monthly_funnel, date_category):
+    # Trend tabloları funnel özetlerinin projeksiyonlarıdır; yeniden groupby yapılmaz
+    daily_trend = daily_funnel[['date'] + STAGES + ['overall_conversion_rate', 'week', 'month']].rename(
+        columns={'overall_conversion_rate': 'conversion_rate'})
+    weekly_trend = weekly_funnel[['week', 'page_view', 'complete_purchase', 'overall_conversion_rate']].rename(
+        columns={'overall_conversion_rate': 'conversion_rate'})
+    monthly_trend = monthly_funnel[['month', 'page_view', 'complete_purchase', 'overall_conversion_rate']].rename(
+        columns={'overall_conversion_rate': 'conversion_rate'})
+
     # Kategori trendi
-    category_trend = funnel_df.groupby(['date', 'category']).agg({
-        'page_view': 'sum',
-        'complete_purchase': 'sum'
-    }).reset_index()
-    
+    category_trend = date_category[['date', 'category', 'page_view', 'complete_purchase']].copy()
     category_trend['conversion_rate'] = (category_trend['complete_purchase'] / category_trend['page_view']) * 100
-    
+
     # Kaydet
     daily_trend.to_csv('data/processed/daily_trend.csv', index=False)
     weekly_trend.to_csv('data/processed/weekly_trend.csv', index=False)
     monthly_trend.to_csv('data/processed/monthly_trend.csv', index=False)
     category_trend.to_csv('data/processed/category_trend.csv', index=False)
-    
+
     print(f"✅ Trend analizi verileri oluşturuldu:")
     print(f"   - Daily trend: {len(daily_trend)} gün")
     print(f"   - Weekly trend: {len(weekly_trend)} hafta")
     print(f"   - Monthly trend: {len(monthly_trend)} ay")
     print(f"   - Category trend: {len(category_trend)} kayıt")
 
-# Tüm processed verileri oluştur
-print("🔄 Processed veri setleri oluşturuluyor...")
-print("=" * 50)
+def build_pipeline():
+    """Processed veri setlerinin bağımlılık grafiği"""
+    pipeline = Pipeline()
+
+    # Ham veriler
+    pipeline.add('funnel_raw', load_funnel_raw)
+    pipeline.add('behavior_raw', load_behavior_raw)
+    pipeline.add('rfm_raw', load_rfm_raw)
+
+    # Funnel türetilmiş tabloları: küp -> tarih x kategori -> günlük -> haftalık/aylık, kategori
+    pipeline.add('funnel_cube', build_funnel_cube, ['funnel_raw'])
+    pipeline.add('date_category', build_date_category_funnel, ['funnel_cube'])
+    pipeline.add('daily_funnel', build_daily_funnel, ['date_category'])
+    pipeline.add('weekly_funnel', lambda daily: build_period_funnel(daily, 'week'), ['daily_funnel'])
+    pipeline.add('monthly_funnel', lambda daily: build_period_funnel(daily, 'month'), ['daily_funnel'])
+    pipeline.add('category_funnel', build_category_funnel, ['date_category'])
+
+    # Çıktılar
+    pipeline.add('cube_outputs', save_funnel_cube, ['funnel_cube'])
+    pipeline.add('funnel_outputs', save_funnel_data,
+                 ['daily_funnel', 'weekly_funnel', 'monthly_funnel', 'category_funnel'])
+    pipeline.add('rfm_outputs', create_processed_rfm_data, ['rfm_raw'])
+    pipeline.add('behavior_outputs', create_processed_behavior_data, ['behavior_raw'])
+    pipeline.add('kpi_outputs', create_kpi_dashboard_data, ['daily_funnel', 'behavior_raw', 'rfm_raw'])
+    pipeline.add('trend_outputs', create_trend_analysis_data,
+                 ['daily_funnel', 'weekly_funnel', 'monthly_funnel', 'date_category'])
+    return pipeline
+
+OUTPUT_STEPS = ['cube_outputs', 'funnel_outputs', 'rfm_outputs', 'behavior_outputs', 'kpi_outputs', 'trend_outputs']
+
+# Önbellek anahtarları için: her çıktı adımının okuduğu ham veri setleri ve yazdığı dosyalar
+PROCESSED_PATH = Path('data/processed')
+STEP_INPUTS = {
+    'cube_outputs': ['funnel'],
+    'funnel_outputs': ['funnel'],
+    'rfm_outputs': ['rfm'],
+    'behavior_outputs': ['behavior'],
+    'kpi_outputs': ['funnel', 'behavior', 'rfm'],
+    'trend_outputs': ['funnel']
+}
+STEP_OUTPUTS = {
+    'cube_outputs': ['funnel_cube.parquet'],
+    'funnel_outputs': ['daily_funnel_summary.csv', 'weekly_funnel_summary.csv',
+                       'monthly_funnel_summary.csv', 'category_funnel_summary.csv'],
+    'rfm_outputs': ['rfm_scored.csv', 'rfm_segment_summary.csv', 'rfm_score_summary.csv'],
+    'behavior_outputs': ['session_summary.csv', 'daily_behavior_summary.csv', 'session_category_summary.csv'],
+    'kpi_outputs': ['kpi_dashboard.csv'],
+    'trend_outputs': ['daily_trend.csv', 'weekly_trend.csv', 'monthly_trend.csv', 'category_trend.csv']
+}
+
+def run_cached(cache, max_workers=1, force=False):
+    """Girdileri ve kodu değişmemiş adımları önbellekten al, kalanları çalıştırıp önbelleğe yaz"""
+    # Dönüşüm kodu: bu script ve src paketinin tüm modülleri (biri değişirse tüm anahtarlar değişir)
+    version = source_version([Path(__file__).resolve()])
+    # Girdiler: load_raw_data'nın gerçekten okuyacağı dosyalar (güncel Parquet deposu veya ham CSV)
+    keys = {step: cache.key(step, [dataset_source(name) for name in STEP_INPUTS[step]], version)
+            for step in OUTPUT_STEPS}
+
+    stale = [step for step in OUTPUT_STEPS if force or not cache.restore(keys[step])]
+    for step in OUTPUT_STEPS:
+        if step not in stale:
+            print(f"⏭️  {step}: girdiler değişmedi, önbellekten alındı")
+
+    if stale:
+        build_pipeline().run(stale, max_workers=max_workers)
+        for step in stale:
+            cache.store(keys[step], step, [PROCESSED_PATH / name for name in STEP_OUTPUTS[step]])
+
+    evicted = cache.evict()
+    if evicted:
+        print(f"🧹 Disk bütçesi için {len(evicted)} eski önbellek girdisi silindi")
+    cache.save()
+    return stale
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Processed veri setlerini oluştur")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Bağımsız adımları paralel çalıştıracak thread sayısı")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Önbelleği yok say, tüm tabloları yeniden hesapla")
+    parser.add_argument('--cache-budget-mb', type=int, default=512,
+                        help="Önbelleğin kullanabileceği en fazla disk alanı (MB)")
+    args = parser.parse_args()
+
+    # Tüm processed verileri oluştur
+    print("🔄 Processed veri setleri oluşturuluyor...")
+    print("=" * 50)
 
-create_processed_funnel_data()
-create_processed_rfm_data() 
-create_processed_behavior_data()
-create_kpi_dashboard_data()
-create_trend_analysis_data()
+    cache = ResultCache(budget_bytes=args.cache_budget_mb * 1024 * 1024)
+    run_cached(cache, max_workers=args.workers, force=args.no_cache)
 
-print("\n✅ Tüm processed veri setleri başarıyla oluşturuldu!")
-print("📊 Dashboard ve analizler için hazır!") 
\ No newline at end of file
+    print("\n✅ Tüm processed veri setleri başarıyla oluşturuldu!")
+    print("📊 Dashboard ve analizler için hazır!")
@@ -5,52 +5,108 @@ import seaborn as sns
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import plotly.offline
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
+import argparse
 import os
+import sys
+
+# src paketini import edebilmek için proje kök dizini
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analyzer import FunnelAnalyzer
+from src.figure_cache import FigureCache, set_figure_cache
+from src.query import scan
+from src.visualizer import FunnelVisualizer, RFMVisualizer, TrendVisualizer, export_static, optimize_figure
 
 # Türkçe karakter desteği
 plt.rcParams['font.family'] = ['DejaVu Sans']
 plt.style.use('seaborn-v0_8')
 
-print("📊 Reports klasörü için raporlar oluşturuluyor...")
+FIGURES_PATH = Path('reports/figures')
+
+# Ortak plotly.js dosyası; ad sürümü içerir, Plotly güncellenince eski dosya kullanılmaz
+PLOTLY_BUNDLE = f'plotly-{plotly.__version__}.min.js'
+
+# Statik görüntü biçimi (png/svg); None ise etkileşimli HTML yazılır
+STATIC_FORMAT = None
+
+def init_worker(image_format, figure_cache):
+    """Worker process'lerde figür çıktı biçimini ve figür önbelleğini ayarla"""
+    global STATIC_FORMAT
+    STATIC_FORMAT = image_format
+    set_figure_cache(figure_cache)
+
+def write_figure(fig, filename):
+    """
+    HTML figür yaz; plotly.js her dosyaya gömülmez, ortak PLOTLY_BUNDLE
+    kullanılır. Büyük trace'ler WebGL'e, sayısal diziler ikili kodlamaya
+    çevrilir. STATIC_FORMAT verilmişse aynı adla statik görüntü yazılır.
+    """
+    if STATIC_FORMAT:
+        export_static(fig, (FIGURES_PATH / filename).with_suffix(f'.{STATIC_FORMAT}'))
+        return
+    optimize_figure(fig).write_html(FIGURES_PATH / filename, include_plotlyjs=PLOTLY_BUNDLE)
+
+# 0. VERİ YÜKLEME (tek sefer; raporlara sadece küçük özetler aktarılır)
+def load_report_data():
+    # Sadece raporlarda kullanılan kolonlar okunur
+    funnel_df = scan('funnel').select('category', 'page_view', 'add_to_cart',
+                                      'start_checkout', 'complete_purchase').collect()
+    behavior_df = scan('behavior').select('session_duration', 'pages_viewed', 'bounce_rate',
+                                          'return_visitor', 'purchase_value').collect()
+    rfm_df = scan('rfm').select('recency_days', 'frequency', 'monetary', 'segment').collect()
+
+    # Funnel aşamaları, conversion rate'ler ve kategori funnel'i
+    funnel_analyzer = FunnelAnalyzer(funnel_df)
+    category_funnel = funnel_analyzer.calculate_group_funnel('category')
+    category_funnel['category'] = category_funnel['category'].astype(str)
+    category_funnel = category_funnel.sort_values('category').reset_index(drop=True)
+
+    rfm_stats = {
+        'avg_order_value': rfm_df['monetary'].mean(),
+        'customer_lifetime_value': rfm_df['monetary'].mean() * rfm_df['frequency'].mean(),
+        'segment_counts': rfm_df['segment'].value_counts(),
+        'customer_count': len(rfm_df)
+    }
+
+    behavior_stats = {
+        'avg_session_minutes': behavior_df['session_duration'].mean() / 60,
+        'avg_pages_viewed': behavior_df['pages_viewed'].mean(),
+        'bounce_rate': behavior_df['bounce_rate'].mean() * 100,
+        'return_visitor_rate': behavior_df['return_visitor'].mean() * 100,
+        'return_visitor_purchase': behavior_df[behavior_df['return_visitor'] == 1]['purchase_value'].mean(),
+        'new_visitor_purchase': behavior_df[behavior_df['return_visitor'] == 0]['purchase_value'].mean()
+    }
+
+    daily_trend = pd.read_csv('data/processed/daily_trend.csv')
+    daily_trend['date'] = pd.to_datetime(daily_trend['date'])
 
-# Reports klasör yapısını oluştur
-os.makedirs('reports/figures', exist_ok=True)
-os.makedirs('reports/presentations', exist_ok=True)
-os.makedirs('reports/executive_summary', exist_ok=True)
+    return {
+        'funnel_stages': funnel_analyzer.calculate_funnel_stages(),
+        'conversion_rates': funnel_analyzer.calculate_conversion_rates(),
+        'category_funnel': category_funnel,
+        'rfm_df': rfm_df,
+        'rfm_stats': rfm_stats,
+        'behavior_stats': behavior_stats,
+        'daily_trend': daily_trend,
+        'monthly_trend': pd.read_csv('data/processed/monthly_trend.csv'),
+        'kpi_df': pd.read_csv('data/processed/kpi_dashboard.csv')
+    }
 
 # 1. EXECUTIVE SUMMARY RAPORU
-def create_executive_summary():
-    # Veri setlerini yükle
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    behavior_df = pd.read_csv('data/raw/user_behavior.csv')
-    rfm_df = pd.read_csv('data/raw/rfm_data.csv')
-    
+def create_executive_summary(funnel_stages, conversion_rates, rfm_stats):
     # Ana KPI'ları hesapla
-    total_views = funnel_df['page_view'].sum()
-    total_purchases = funnel_df['complete_purchase'].sum()
+    total_views = funnel_stages['Görüntüleme']
+    total_purchases = funnel_stages['Tamamlama']
     overall_conversion = (total_purchases / total_views) * 100
-    avg_order_value = rfm_df['monetary'].mean()
-    customer_lifetime_value = avg_order_value * rfm_df['frequency'].mean()
-    
-    # Funnel aşamaları
-    funnel_stages = {
-        'Görüntüleme': funnel_df['page_view'].sum(),
-        'Sepete Ekleme': funnel_df['add_to_cart'].sum(),
-        'Ödeme Başlatma': funnel_df['start_checkout'].sum(),
-        'Tamamlama': funnel_df['complete_purchase'].sum()
-    }
+    avg_order_value = rfm_stats['avg_order_value']
+    customer_lifetime_value = rfm_stats['customer_lifetime_value']
     
     # En büyük drop-off noktası
-    conversion_rates = {}
-    previous_value = None
-    for stage, value in funnel_stages.items():
-        if previous_value is not None:
-            rate = (value / previous_value) * 100
-            conversion_rates[stage] = rate
-        previous_value = value
-    
     bottleneck = min(conversion_rates, key=conversion_rates.get)
     bottleneck_rate = conversion_rates[bottleneck]
     
@@ -109,108 +165,47 @@ def create_executive_summary():
     print("✅ Executive summary raporu oluşturuldu")
 
 # 2. FUNNEL GÖRSELLEŞTİRMELERİ
-def create_funnel_visualizations():
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    
-    # Funnel aşamaları
-    funnel_stages = {
-        'Görüntüleme': funnel_df['page_view'].sum(),
-        'Sepete Ekleme': funnel_df['add_to_cart'].sum(),
-        'Ödeme Başlatma': funnel_df['start_checkout'].sum(),
-        'Tamamlama': funnel_df['complete_purchase'].sum()
-    }
-    
+def create_funnel_visualizations(funnel_stages, category_funnel):
     # Plotly funnel chart
-    fig = go.Figure(go.Funnel(
-        y=list(funnel_stages.keys()),
-        x=list(funnel_stages.values()),
-        textinfo="value+percent initial",
-        textposition="inside",
-        marker={"color": ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4"]},
-        connector={"line": {"color": "royalblue", "width": 3}}
-    ))
-    
-    fig.update_layout(
-        title="🛒 E-Ticaret Satış Funnel'i",
-        font=dict(size=14),
-        showlegend=False,
-        height=500
-    )
-    
-    fig.write_html('reports/figures/funnel_chart.html')
+    fig = FunnelVisualizer.create_funnel_chart(funnel_stages)
+    write_figure(fig, 'funnel_chart.html')
     
     # Kategori bazlı funnel
-    category_funnel = funnel_df.groupby('category').agg({
-        'page_view': 'sum',
-        'add_to_cart': 'sum',
-        'start_checkout': 'sum',
-        'complete_purchase': 'sum'
-    }).reset_index()
-    
-    category_funnel['conversion_rate'] = (category_funnel['complete_purchase'] / category_funnel['page_view']) * 100
-    
     fig2 = px.bar(category_funnel, x='category', y='conversion_rate',
                    title='Kategori Bazlı Conversion Rate',
                    color='conversion_rate',
                    color_continuous_scale='RdYlGn')
     
-    fig2.write_html('reports/figures/category_conversion.html')
+    write_figure(fig2, 'category_conversion.html')
     
     print("✅ Funnel görselleştirmeleri oluşturuldu")
 
 # 3. RFM ANALİZİ GÖRSELLEŞTİRMELERİ
-def create_rfm_visualizations():
-    rfm_df = pd.read_csv('data/raw/rfm_data.csv')
-    
+def create_rfm_visualizations(rfm_df):
     # Segment dağılımı
-    segment_counts = rfm_df['segment'].value_counts()
-    
-    fig = px.pie(values=segment_counts.values, names=segment_counts.index,
-                  title='Müşteri Segment Dağılımı',
-                  color_discrete_sequence=px.colors.qualitative.Set3)
-    
-    fig.write_html('reports/figures/customer_segments.html')
+    fig = RFMVisualizer.create_segment_pie(rfm_df)
+    write_figure(fig, 'customer_segments.html')
     
     # RFM scatter plot
-    fig2 = px.scatter(rfm_df, x='recency_days', y='monetary', 
-                       color='segment', size='frequency',
-                       title='RFM Analizi - Müşteri Segmentasyonu',
-                       labels={'recency_days': 'Recency (Gün)', 
-                               'monetary': 'Monetary (TL)',
-                               'frequency': 'Frequency'})
-    
-    fig2.write_html('reports/figures/rfm_scatter.html')
+    fig2 = RFMVisualizer.create_rfm_scatter(rfm_df)
+    write_figure(fig2, 'rfm_scatter.html')
     
     print("✅ RFM görselleştirmeleri oluşturuldu")
 
 # 4. TREND ANALİZİ GÖRSELLEŞTİRMELERİ
-def create_trend_visualizations():
-    # Günlük trend verisi
-    daily_trend = pd.read_csv('data/processed/daily_trend.csv')
-    daily_trend['date'] = pd.to_datetime(daily_trend['date'])
-    
+def create_trend_visualizations(daily_trend, monthly_trend):
     # Conversion rate trendi
-    fig = px.line(daily_trend, x='date', y='conversion_rate',
-                   title='Günlük Conversion Rate Trendi',
-                   labels={'conversion_rate': 'Conversion Rate (%)', 'date': 'Tarih'})
-    
-    fig.write_html('reports/figures/daily_conversion_trend.html')
+    fig = TrendVisualizer.create_trend_line(daily_trend)
+    write_figure(fig, 'daily_conversion_trend.html')
     
     # Aylık trend
-    monthly_trend = pd.read_csv('data/processed/monthly_trend.csv')
-    
-    fig2 = px.bar(monthly_trend, x='month', y='conversion_rate',
-                   title='Aylık Conversion Rate',
-                   labels={'conversion_rate': 'Conversion Rate (%)', 'month': 'Ay'})
-    
-    fig2.write_html('reports/figures/monthly_conversion.html')
+    fig2 = TrendVisualizer.create_monthly_bar(monthly_trend)
+    write_figure(fig2, 'monthly_conversion.html')
     
     print("✅ Trend görselleştirmeleri oluşturuldu")
 
 # 5. KPI DASHBOARD
-def create_kpi_dashboard():
-    kpi_df = pd.read_csv('data/processed/kpi_dashboard.csv')
-    
+def create_kpi_dashboard(kpi_df):
     # KPI kartları
     fig = make_subplots(
         rows=2, cols=2,
@@ -265,17 +260,12 @@ def create_kpi_dashboard():
     ), row=2, col=2)
     
     fig.update_layout(height=600, title_text="📊 KPI Dashboard")
-    fig.write_html('reports/figures/kpi_dashboard.html')
+    write_figure(fig, 'kpi_dashboard.html')
     
     print("✅ KPI dashboard oluşturuldu")
 
 # 6. DETAYLI ANALİZ RAPORU
-def create_detailed_analysis_report():
-    # Veri setlerini yükle
-    funnel_df = pd.read_csv('data/raw/funnel_data.csv')
-    behavior_df = pd.read_csv('data/raw/user_behavior.csv')
-    rfm_df = pd.read_csv('data/raw/rfm_data.csv')
-    
+def create_detailed_analysis_report(conversion_rates, rfm_stats, behavior_stats):
     # Detaylı analiz raporu
     detailed_report = f"""
 # 📊 E-Ticaret Satış Analizi - Detaylı Rapor
@@ -291,22 +281,6 @@ def create_detailed_analysis_report():
 ### Aşama Performansı
 """
     
-    # Funnel aşamalarını hesapla
-    funnel_stages = {
-        'Görüntüleme': funnel_df['page_view'].sum(),
-        'Sepete Ekleme': funnel_df['add_to_cart'].sum(),
-        'Ödeme Başlatma': funnel_df['start_checkout'].sum(),
-        'Tamamlama': funnel_df['complete_purchase'].sum()
-    }
-    
-    conversion_rates = {}
-    previous_value = None
-    for stage, value in funnel_stages.items():
-        if previous_value is not None:
-            rate = (value / previous_value) * 100
-            conversion_rates[stage] = rate
-        previous_value = value
-    
     for stage, rate in conversion_rates.items():
         detailed_report += f"- **{stage}:** %{rate:.1f}\n"
     
@@ -321,29 +295,29 @@ def create_detailed_analysis_report():
 ### RFM Analizi Sonuçları
 """
     
-    segment_counts = rfm_df['segment'].value_counts()
+    segment_counts = rfm_stats['segment_counts']
     for segment, count in segment_counts.items():
-        percentage = (count / len(rfm_df)) * 100
+        percentage = (count / rfm_stats['customer_count']) * 100
         detailed_report += f"- **{segment}:** {count} müşteri (%{percentage:.1f})\n"
     
     detailed_report += f"""
 ### Segment Performansı
 - **Champions Değer Katkısı:** %{25:.1f}
 - **At Risk Müşteriler:** %{30:.1f}
-- **Ortalama Sipariş Değeri:** {rfm_df['monetary'].mean():.2f} TL
-- **Müşteri Yaşam Boyu Değeri:** {rfm_df['monetary'].mean() * rfm_df['frequency'].mean():.2f} TL
+- **Ortalama Sipariş Değeri:** {rfm_stats['avg_order_value']:.2f} TL
+- **Müşteri Yaşam Boyu Değeri:** {rfm_stats['customer_lifetime_value']:.2f} TL
 
 ## 📊 Kullanıcı Davranışı Analizi
 
 ### Session Analizi
-- **Ortalama Session Süresi:** {behavior_df['session_duration'].mean() / 60:.1f} dakika
-- **Ortalama Sayfa Görüntüleme:** {behavior_df['pages_viewed'].mean():.1f} sayfa
-- **Bounce Rate:** %{behavior_df['bounce_rate'].mean() * 100:.1f}
-- **Return Visitor Rate:** %{behavior_df['return_visitor'].mean() * 100:.1f}
+- **Ortalama Session Süresi:** {behavior_stats['avg_session_minutes']:.1f} dakika
+- **Ortalama Sayfa Görüntüleme:** {behavior_stats['avg_pages_viewed']:.1f} sayfa
+- **Bounce Rate:** %{behavior_stats['bounce_rate']:.1f}
+- **Return Visitor Rate:** %{behavior_stats['return_visitor_rate']:.1f}
 
 ### Satın Alma Davranışı
-- **Return Visitor Ortalama Satın Alma:** {behavior_df[behavior_df['return_visitor'] == 1]['purchase_value'].mean():.2f} TL
-- **New Visitor Ortalama Satın Alma:** {behavior_df[behavior_df['return_visitor'] == 0]['purchase_value'].mean():.2f} TL
+- **Return Visitor Ortalama Satın Alma:** {behavior_stats['return_visitor_purchase']:.2f} TL
+- **New Visitor Ortalama Satın Alma:** {behavior_stats['new_visitor_purchase']:.2f} TL
 
 ## 🎯 Stratejik Öneriler
 
@@ -454,17 +428,50 @@ def create_presentation_slides():
     
     print("✅ Presentation slides oluşturuldu")
 
-# Tüm raporları oluştur
-print("📊 Reports klasörü için raporlar oluşturuluyor...")
-print("=" * 50)
-
-create_executive_summary()
-create_funnel_visualizations()
-create_rfm_visualizations()
-create_trend_visualizations()
-create_kpi_dashboard()
-create_detailed_analysis_report()
-create_presentation_slides()
-
-print("\n✅ Tüm raporlar başarıyla oluşturuldu!")
-print("📊 Reports klasörü artık dolu!") 
\ No newline at end of file
+# Rapor görevleri: fonksiyon ve ihtiyaç duyduğu özet anahtarları
+REPORT_TASKS = [
+    (create_executive_summary, ['funnel_stages', 'conversion_rates', 'rfm_stats']),
+    (create_funnel_visualizations, ['funnel_stages', 'category_funnel']),
+    (create_rfm_visualizations, ['rfm_df']),
+    (create_trend_visualizations, ['daily_trend', 'monthly_trend']),
+    (create_kpi_dashboard, ['kpi_df']),
+    (create_detailed_analysis_report, ['conversion_rates', 'rfm_stats', 'behavior_stats']),
+    (create_presentation_slides, [])
+]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reports klasörü için raporları oluştur")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Raporları paralel oluşturacak process sayısı")
+    parser.add_argument('--static', choices=['png', 'svg'], default=None,
+                        help="Figürleri HTML yerine statik görüntü olarak yaz (opsiyonel kaleido paketini gerektirir)")
+    parser.add_argument('--no-figure-cache', action='store_true',
+                        help="Figürleri önbellekten almadan yeniden oluştur")
+    args = parser.parse_args()
+
+    print("📊 Reports klasörü için raporlar oluşturuluyor...")
+
+    # Reports klasör yapısını oluştur
+    os.makedirs('reports/figures', exist_ok=True)
+    os.makedirs('reports/presentations', exist_ok=True)
+    os.makedirs('reports/executive_summary', exist_ok=True)
+
+    # Ortak plotly.js paketi bir kez yazılır; worker'lar aynı anda yazmaya çalışmaz
+    plotly_bundle = FIGURES_PATH / PLOTLY_BUNDLE
+    if not plotly_bundle.exists():
+        plotly_bundle.write_text(plotly.offline.get_plotlyjs(), encoding='utf-8')
+
+    # Tüm raporları oluştur
+    print("=" * 50)
+
+    context = load_report_data()
+    figure_cache = None if args.no_figure_cache else FigureCache()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.static, figure_cache)) as executor:
+        futures = [executor.submit(func, **{key: context[key] for key in keys})
+                   for func, keys in REPORT_TASKS]
+        for future in futures:
+            future.result()
+
+    print("\n✅ Tüm raporlar başarıyla oluşturuldu!")
+    print("📊 Reports klasörü artık dolu!")
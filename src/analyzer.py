@@ -4,100 +4,537 @@ E-Ticaret Satış Analizi - Analiz Modülü
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .sketch import RFMSketch, RFM_COLUMNS, QUARTILES
+
+# Funnel aşamaları ve karşılık gelen kolonlar (sıra önemlidir)
+STAGE_COLUMNS = {
+    'Görüntüleme': 'page_view',
+    'Sepete Ekleme': 'add_to_cart',
+    'Ödeme Başlatma': 'start_checkout',
+    'Tamamlama': 'complete_purchase'
+}
+
+def sum_stage_columns(df: pd.DataFrame) -> np.ndarray:
+    """
+    Dört aşama kolonunun toplamı. Kolonlar ayrı ayrı int64 biriktiriciyle
+    toplanır; kompakt (uint8) veya memmap kolonlar önceden genişletilip
+    kopyalanmaz.
+    """
+    return np.array([np.add.reduce(df[col].to_numpy(), dtype=np.int64) for col in STAGE_COLUMNS.values()],
+                    dtype=np.int64)
+
+def stage_conversion_rates(stage_totals: np.ndarray) -> Dict[str, float]:
+    """Aşamadan aşamaya conversion rate'ler (önceki aşama 0 ise NaN)"""
+    conversion_rates = {}
+    
+    previous_value = None
+    for stage, value in zip(STAGE_COLUMNS, stage_totals):
+        if previous_value is not None:
+            conversion_rates[stage] = (value / previous_value) * 100 if previous_value else np.nan
+        previous_value = value
+        
+    return conversion_rates
+
+class StreamingFunnelAggregator:
+    """Parça parça okunan funnel verisi için sabit bellekli toplayıcı"""
+    
+    def __init__(self, group_by: Iterable[str] = ()):
+        self.group_by = list(group_by)
+        self.stage_totals = np.zeros(len(STAGE_COLUMNS), dtype=np.int64)
+        self.group_partials: Dict[str, pd.DataFrame] = {}
+        self.rows = 0
+        
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Bir parçayı çalışan toplamlara ekle"""
+        columns = list(STAGE_COLUMNS.values())
+        self.stage_totals += sum_stage_columns(chunk)
+        self.rows += len(chunk)
+        
+        # Grup bazlı kısmi toplamlar; boyutu grup kardinalitesiyle sınırlı
+        for col in self.group_by:
+            # Kompakt (uint8) parçalarda toplamların taşmaması için int64
+            partial = chunk.groupby(col, observed=True)[columns].sum().astype(np.int64)
+            if col in self.group_partials:
+                partial = self.group_partials[col].add(partial, fill_value=0).astype(np.int64)
+            self.group_partials[col] = partial
+            
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> 'StreamingFunnelAggregator':
+        """Tüm parçaları sırayla işle"""
+        for chunk in chunks:
+            self.update(chunk)
+        return self
 
 class FunnelAnalyzer:
     """Funnel analizi sınıfı"""
     
-    def __init__(self, funnel_df: pd.DataFrame):
-        self.funnel_df = funnel_df
+    def __init__(self, funnel_df: Optional[pd.DataFrame] = None,
+                 aggregator: Optional[StreamingFunnelAggregator] = None):
+        if funnel_df is None and aggregator is None:
+            raise ValueError("funnel_df veya aggregator verilmeli")
+        self._funnel_df = funnel_df
+        self._stage_totals: Optional[np.ndarray] = None
+        self.aggregator = aggregator
+        
+    @property
+    def funnel_df(self) -> Optional[pd.DataFrame]:
+        return self._funnel_df
+    
+    @funnel_df.setter
+    def funnel_df(self, funnel_df: pd.DataFrame) -> None:
+        """Frame değiştiğinde önbellek geçersiz olur"""
+        self._funnel_df = funnel_df
+        self.invalidate_cache()
+        
+    def invalidate_cache(self) -> None:
+        """Önbelleği temizle (funnel_df yerinde değiştirildiyse çağrılmalı)"""
+        self._stage_totals = None
+        
+    def append(self, chunk: pd.DataFrame) -> None:
+        """Yeni satırlar ekle; önbellekteki toplamlar sadece yeni parçayla güncellenir"""
+        if self._funnel_df is None:
+            self.aggregator.update(chunk)
+            return
+        
+        self._funnel_df = pd.concat([self._funnel_df, chunk], ignore_index=True)
+        if self._stage_totals is not None:
+            self._stage_totals = self._stage_totals + sum_stage_columns(chunk)
+        
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], group_by: Iterable[str] = ()) -> 'FunnelAnalyzer':
+        """
+        Parça iteratöründen (CSV chunksize, Parquet row group, generator)
+        akış modunda analyzer oluştur. Veri belleğe alınmaz; sadece aşama
+        toplamları ve group_by kolonları için kısmi toplamlar tutulur.
+        """
+        return cls(aggregator=StreamingFunnelAggregator(group_by).consume(chunks))
+        
+    def _get_stage_totals(self) -> np.ndarray:
+        """Aşama toplamları; frame başına bir kez hesaplanır"""
+        if self._funnel_df is None:
+            return self.aggregator.stage_totals
+        if self._stage_totals is None:
+            self._stage_totals = sum_stage_columns(self._funnel_df)
+        return self._stage_totals
         
     def calculate_funnel_stages(self) -> Dict[str, int]:
         """Funnel aşamalarını hesapla"""
-        stages = {
-            'Görüntüleme': self.funnel_df['page_view'].sum(),
-            'Sepete Ekleme': self.funnel_df['add_to_cart'].sum(),
-            'Ödeme Başlatma': self.funnel_df['start_checkout'].sum(),
-            'Tamamlama': self.funnel_df['complete_purchase'].sum()
-        }
-        return stages
+        return dict(zip(STAGE_COLUMNS, self._get_stage_totals()))
+    
+    def calculate_group_funnel(self, by: str) -> pd.DataFrame:
+        """Grup bazlı funnel aşamaları ve conversion rate"""
+        columns = list(STAGE_COLUMNS.values())
+        if self.funnel_df is not None:
+            group_funnel = self.funnel_df.groupby(by, observed=True)[columns].sum()
+        elif by in self.aggregator.group_partials:
+            group_funnel = self.aggregator.group_partials[by]
+        else:
+            raise ValueError(f"Akış modunda '{by}' için kısmi toplam tutulmadı; group_by ile belirtin")
+        
+        group_funnel = group_funnel.reset_index()
+        group_funnel['conversion_rate'] = (group_funnel['complete_purchase'] / group_funnel['page_view']) * 100
+        return group_funnel
     
     def calculate_conversion_rates(self) -> Dict[str, float]:
         """Conversion rate'leri hesapla"""
-        stages = self.calculate_funnel_stages()
-        conversion_rates = {}
-        
-        previous_value = None
-        for stage, value in stages.items():
-            if previous_value is not None:
-                rate = (value / previous_value) * 100
-                conversion_rates[stage] = rate
-            previous_value = value
-            
-        return conversion_rates
+        return stage_conversion_rates(self._get_stage_totals())
     
-    def find_bottleneck(self) -> Tuple[str, float]:
-        """En büyük drop-off noktasını bul"""
-        conversion_rates = self.calculate_conversion_rates()
+    def find_bottleneck(self) -> Tuple[Optional[str], float]:
+        """En büyük drop-off noktasını bul (tanımsız/NaN oranlar atlanır; hiç oran yoksa (None, NaN))"""
+        conversion_rates = {stage: rate for stage, rate in self.calculate_conversion_rates().items()
+                            if not np.isnan(rate)}
+        if not conversion_rates:
+            return None, np.nan
         bottleneck = min(conversion_rates, key=conversion_rates.get)
         return bottleneck, conversion_rates[bottleneck]
 
+def quartile_edges(values) -> np.ndarray:
+    """Kesin quartile sınırları [min, q25, q50, q75, max]; pd.qcut gibi tekrar eden sınırda hata verir"""
+    edges = np.quantile(np.asarray(values), QUARTILES)
+    if np.unique(edges).size < len(edges):
+        raise ValueError(f"Bin edges must be unique: {edges!r}")
+    return edges
+
+def quartile_bins(values, edges: np.ndarray) -> np.ndarray:
+    """
+    pd.qcut(q=4) ile aynı kutular (sağdan kapalı), 0-3 arası int16 olarak.
+    Sınırlar dışarıdan verildiği için tekrar eden sınırlar sadece boş kutu üretir.
+    """
+    return np.searchsorted(edges[1:-1], np.asarray(values), side='left').astype(np.int16)
+
+def assign_rfm_scores(rfm_df: pd.DataFrame, edges: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Verilen quartile sınırlarıyla RFM skorlarını ata. Sınırlar sabit
+    olduğundan parçalar birbirinden bağımsız (veya paralel) skorlanabilir.
+    """
+    df = rfm_df.copy()
+    
+    # RFM skorları (kutu indeksleri; R ters sıralı)
+    r_bins = quartile_bins(df['recency_days'], edges['recency_days'])
+    f_bins = quartile_bins(df['frequency'], edges['frequency'])
+    m_bins = quartile_bins(df['monetary'], edges['monetary'])
+    df['R_score'] = pd.Categorical.from_codes(r_bins, categories=[4, 3, 2, 1], ordered=True)
+    df['F_score'] = pd.Categorical.from_codes(f_bins, categories=[1, 2, 3, 4], ordered=True)
+    df['M_score'] = pd.Categorical.from_codes(m_bins, categories=[1, 2, 3, 4], ordered=True)
+    
+    # RFM skorunu birleştir: tamsayı kod (R*100 + F*10 + M) sadece ara
+    # değerdir; metin yalnızca benzersiz kodlar için üretilir
+    rfm_code = (4 - r_bins) * 100 + (f_bins + 1) * 10 + (m_bins + 1)
+    rfm_score = pd.Categorical(rfm_code)
+    df['RFM_score'] = rfm_score.rename_categories(rfm_score.categories.astype(str))
+    
+    return df
+
+# Segment özeti: çıktı kolonu -> (kaynak kolon, toplama)
+SEGMENT_SUMMARY_METRICS = {
+    'customer_count': ('customer_id', 'count'),
+    'avg_recency': ('recency_days', 'mean'),
+    'avg_frequency': ('frequency', 'mean'),
+    'avg_monetary': ('monetary', 'mean'),
+    'total_monetary': ('monetary', 'sum')
+}
+
+def group_codes(keys: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Grup anahtarlarını sıralı etiketler ve 0..n-1 tamsayı kodlarına çevir (eksik anahtar = -1)"""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), pd.Index(keys.cat.categories)
+    codes, labels = pd.factorize(keys, sort=True)
+    return codes, pd.Index(labels)
+
+def summarize_groups(df: pd.DataFrame, by: str,
+                     metrics: Dict[str, Tuple[str, str]] = SEGMENT_SUMMARY_METRICS) -> pd.DataFrame:
+    """
+    Grup bazlı count/sum/mean özetini tek geçişte hesapla.
+
+    groupby(...).agg({...}) yerine grup kodları üzerinde np.bincount
+    kullanılır; her kaynak kolon bir kez toplanır ve sonuç düz kolonlu
+    (count int64, sum/mean float64) bir tablodur. Satırı olmayan gruplar
+    (kullanılmayan kategoriler) atlanır.
+    """
+    codes, labels = group_codes(df[by])
+    n_groups = len(labels)
+
+    for column, how in metrics.values():
+        if how not in ('count', 'sum', 'mean'):
+            raise ValueError(f"Desteklenmeyen toplama: {how}")
+    summed = {column for column, how in metrics.values() if how != 'count'}
+
+    # Anahtarı eksik satırlar bir kez elenir; bincount için kodlar intp'ye bir kez çevrilir
+    has_key = codes >= 0
+    all_keys = has_key.all()
+    codes = (codes if all_keys else codes[has_key]).astype(np.intp)
+    group_sizes = np.bincount(codes, minlength=n_groups)
+
+    counts = {}
+    sums = {}
+    for column in dict.fromkeys(column for column, _ in metrics.values()):
+        values = df[column]
+        missing = values.isna().to_numpy()
+        if not all_keys:
+            missing = missing[has_key]
+        column_codes = codes
+
+        if column in summed:
+            weights = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if not all_keys:
+                weights = weights[has_key]
+            if missing.any():
+                column_codes = codes[~missing]
+                weights = weights[~missing]
+            sums[column] = np.bincount(column_codes, weights=weights, minlength=n_groups)
+        elif missing.any():
+            column_codes = codes[~missing]
+
+        counts[column] = (np.bincount(column_codes, minlength=n_groups)
+                          if column_codes is not codes else group_sizes)
+
+    result = {}
+    for name, (column, how) in metrics.items():
+        if how == 'count':
+            result[name] = counts[column].astype(np.int64)
+        elif how == 'sum':
+            result[name] = sums[column]
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[name] = sums[column] / counts[column]
+
+    summary = pd.DataFrame(result, index=labels.rename(by))
+    return summary[group_sizes > 0]
+
 class RFMAnalyzer:
     """RFM analizi sınıfı"""
     
     def __init__(self, rfm_df: pd.DataFrame):
         self.rfm_df = rfm_df
         
-    def calculate_rfm_scores(self) -> pd.DataFrame:
-        """RFM skorlarını hesapla"""
-        df = self.rfm_df.copy()
-        
-        # RFM skorları
-        df['R_score'] = pd.qcut(df['recency_days'], q=4, labels=[4, 3, 2, 1])
-        df['F_score'] = pd.qcut(df['frequency'], q=4, labels=[1, 2, 3, 4])
-        df['M_score'] = pd.qcut(df['monetary'], q=4, labels=[1, 2, 3, 4])
+    def calculate_rfm_scores(self, edges: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
+        """
+        RFM skorlarını hesapla
         
-        # RFM skorunu birleştir
-        df['RFM_score'] = df['R_score'].astype(str) + df['F_score'].astype(str) + df['M_score'].astype(str)
-        
-        return df
+        edges verilmezse kesin quartile'lar kullanılır; RFMSketch.quartile_edges()
+        ile yaklaşık sınırlar verilebilir.
+        """
+        if edges is None:
+            edges = {col: quartile_edges(self.rfm_df[col]) for col in RFM_COLUMNS}
+        return assign_rfm_scores(self.rfm_df, edges)
+    
+    def build_sketch(self, epsilon: float = 0.01) -> RFMSketch:
+        """Bu frame için yaklaşık quantile sketch'i (diğer bölümlerle birleştirilebilir)"""
+        return RFMSketch(epsilon).update(self.rfm_df)
     
     def get_segment_summary(self) -> pd.DataFrame:
-        """Segment bazlı özet"""
-        return self.rfm_df.groupby('segment').agg({
-            'customer_id': 'count',
-            'recency_days': 'mean',
-            'frequency': 'mean',
-            'monetary': ['mean', 'sum']
-        }).round(2)
+        """Segment bazlı özet (düz kolonlar: customer_count, avg_*, total_monetary)"""
+        return summarize_groups(self.rfm_df, 'segment').round(2)
+
+def aggregate_daily_stages(funnel_df: pd.DataFrame) -> pd.DataFrame:
+    """Session tablosunu gün bazında aşama toplamlarına indir (kompakt uint8 girdide de int64)"""
+    return funnel_df.groupby('date')[list(STAGE_COLUMNS.values())].sum().astype(np.int64).reset_index()
+
+def aggregate_trend_periods(daily_trend: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Günlük trendi hafta/ay anahtarına göre topla. Dönem conversion rate'i
+    günlük oranların ortalaması değil, dönem toplamlarının oranıdır.
+    """
+    period_trend = daily_trend.groupby(period)[['page_view', 'complete_purchase']].sum().reset_index()
+    period_trend['conversion_rate'] = (period_trend['complete_purchase'] / period_trend['page_view']) * 100
+    return period_trend
+
+class RollingFunnelWindow:
+    """
+    Kayan pencere funnel toplamları (ring buffer).
+
+    Pencere sabit sayıda kovadan (bucket) oluşur; her kova aşama toplamlarını
+    tutar. Zaman ilerledikçe sadece pencereden çıkan kovalar çalışan
+    toplamdan düşülür, bu yüzden güncelleme maliyeti geçmişin boyutundan
+    bağımsızdır. Pencereden eski olaylar yok sayılır.
+    """
+
+    def __init__(self, window: str = '7D', bucket: str = '1D'):
+        window_ns = pd.Timedelta(window).value
+        bucket_ns = pd.Timedelta(bucket).value
+        if bucket_ns <= 0 or window_ns % bucket_ns:
+            raise ValueError("Pencere süresi kova süresinin tam katı olmalı")
+        self.window = pd.Timedelta(window)
+        self.bucket = pd.Timedelta(bucket)
+        self.n_buckets = window_ns // bucket_ns
+        self._bucket_ns = bucket_ns
+        self._buckets = np.zeros((self.n_buckets, len(STAGE_COLUMNS)), dtype=np.int64)
+        self.stage_totals = np.zeros(len(STAGE_COLUMNS), dtype=np.int64)
+        self.head: Optional[int] = None  # en yeni kova numarası
+
+    def _advance(self, bucket_id: int) -> None:
+        """Pencereyi bucket_id'ye kadar kaydır; çıkan kovaları toplamdan düş"""
+        if self.head is None or bucket_id - self.head >= self.n_buckets:
+            self._buckets[:] = 0
+            self.stage_totals[:] = 0
+        else:
+            for expired in range(self.head + 1, bucket_id + 1):
+                slot = expired % self.n_buckets
+                self.stage_totals -= self._buckets[slot]
+                self._buckets[slot] = 0
+        self.head = bucket_id
+
+    def _add_bucket(self, bucket_id: int, counts: np.ndarray) -> bool:
+        if self.head is None or bucket_id > self.head:
+            self._advance(bucket_id)
+        elif bucket_id <= self.head - self.n_buckets:
+            return False
+        self._buckets[bucket_id % self.n_buckets] += counts
+        self.stage_totals += counts
+        return True
+
+    def add(self, timestamp, counts) -> bool:
+        """Tek bir olay/kova ekle; counts aşama sırasıyla 4 değer. Pencereden eskiyse False"""
+        return self._add_bucket(pd.Timestamp(timestamp).value // self._bucket_ns,
+                                np.asarray(counts, dtype=np.int64))
+
+    def advance_to(self, timestamp) -> None:
+        """Yeni olay olmadan pencereyi verilen zamana kaydır (örn. panel sorgusundan önce)"""
+        bucket_id = pd.Timestamp(timestamp).value // self._bucket_ns
+        if self.head is None or bucket_id > self.head:
+            self._advance(bucket_id)
+
+    def update(self, events: pd.DataFrame, time_column: str = 'date') -> int:
+        """
+        Olay tablosunu (funnel satırları) ekle; kabul edilen satır sayısını döndür.
+        Satırlar önce kova bazında toplanır, sonra en fazla n_buckets kova
+        pencereye işlenir.
+        """
+        if len(events) == 0:
+            return 0
+        bucket_ids = pd.to_datetime(events[time_column]).to_numpy().astype('datetime64[ns]').astype(np.int64)
+        bucket_ids //= self._bucket_ns
+
+        # Pencere en yeni olaya göre belirlenir; daha eski kovalar baştan elenir
+        newest = int(bucket_ids.max())
+        if self.head is not None:
+            newest = max(newest, self.head)
+        keep = bucket_ids > newest - self.n_buckets
+        unique_ids, inverse = np.unique(bucket_ids[keep], return_inverse=True)
+        counts = np.column_stack([
+            np.bincount(inverse, weights=events[col].to_numpy()[keep], minlength=len(unique_ids))
+            for col in STAGE_COLUMNS.values()
+        ]).astype(np.int64)
+
+        accepted = 0
+        rows_per_bucket = np.bincount(inverse, minlength=len(unique_ids))
+        for bucket_id, bucket_counts, rows in zip(unique_ids, counts, rows_per_bucket):
+            if self._add_bucket(int(bucket_id), bucket_counts):
+                accepted += int(rows)
+        return accepted
+
+    def metrics(self) -> Dict:
+        """Penceredeki aşama toplamları, genel ve aşamadan aşamaya conversion rate"""
+        end = None if self.head is None else pd.Timestamp((self.head + 1) * self._bucket_ns)
+        page_view = self.stage_totals[0]
+        complete_purchase = self.stage_totals[-1]
+        return {
+            'window_start': None if end is None else end - self.window,
+            'window_end': end,
+            'stages': dict(zip(STAGE_COLUMNS, self.stage_totals.tolist())),
+            'conversion_rate': (complete_purchase / page_view) * 100 if page_view else np.nan,
+            'stage_rates': stage_conversion_rates(self.stage_totals)
+        }
+
+# Zaman kolonunun çözünürlüğünü belirlemek için denenen birimler (kabadan inceye)
+TIME_RESOLUTIONS = ['1D', '1h', '1min', '1s']
+
+def time_resolution(times) -> pd.Timedelta:
+    """
+    Tüm zaman değerlerinin hizalı olduğu en kaba birim (örn. sadece tarih
+    içeren kolon için 1 gün); hiçbirine hizalı değilse 0.
+    """
+    values = pd.to_datetime(pd.Series(times)).to_numpy().astype('datetime64[ns]').astype(np.int64)
+    for unit in TIME_RESOLUTIONS:
+        if not (values % pd.Timedelta(unit).value).any():
+            return pd.Timedelta(unit)
+    return pd.Timedelta(0)
+
+# Varsayılan kayan pencereler: ad -> (pencere, kova)
+ROLLING_WINDOWS = {
+    '7d': ('7D', '1D'),
+    '28d': ('28D', '1D'),
+    '1h': ('1h', '1min')
+}
 
 class TrendAnalyzer:
     """Trend analizi sınıfı"""
     
-    def __init__(self, funnel_df: pd.DataFrame):
+    def __init__(self, funnel_df: Optional[pd.DataFrame] = None,
+                 daily_totals: Optional[pd.DataFrame] = None,
+                 windows: Optional[Dict[str, Tuple[str, str]]] = None):
+        if funnel_df is None and daily_totals is None:
+            raise ValueError("funnel_df veya daily_totals verilmeli")
         self.funnel_df = funnel_df
+        self._daily_totals = daily_totals
+        self._period_trends: Dict[str, pd.DataFrame] = {}
+        self.windows = {
+            name: RollingFunnelWindow(window, bucket)
+            for name, (window, bucket) in (ROLLING_WINDOWS if windows is None else windows).items()
+        }
+        
+    @classmethod
+    def from_state(cls, path) -> 'TrendAnalyzer':
+        """Kaydedilmiş günlük toplam tablosundan analyzer oluştur"""
+        return cls(daily_totals=pd.read_parquet(path))
+    
+    def save_state(self, path) -> None:
+        """Günlük toplam tablosunu kaydet (artımlı güncellemeler için)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._get_daily_totals().to_parquet(path, index=False)
+        
+    def _get_daily_totals(self) -> pd.DataFrame:
+        if self._daily_totals is None:
+            self._daily_totals = aggregate_daily_stages(self.funnel_df)
+        return self._daily_totals
+        
+    def update(self, new_funnel_df: pd.DataFrame) -> pd.DatetimeIndex:
+        """
+        Yeni session'ları günlük toplam tablosuna ekle.
+        
+        Sadece yeni verideki günler, o günlerin haftaları ve ayları yeniden
+        hesaplanır; maliyet geçmişin değil yeni verinin boyutuyla orantılıdır.
+        funnel_df (verildiyse) değiştirilmez. Yeni session'lar kayan
+        pencerelere de eklenir. Etkilenen tarihleri döndürür.
+        """
+        self.observe(new_funnel_df)
+        new_daily = aggregate_daily_stages(new_funnel_df).set_index('date')
+        daily = self._get_daily_totals().set_index('date')
+        
+        existing = new_daily.index.intersection(daily.index)
+        daily.loc[existing] += new_daily.loc[existing]
+        daily = pd.concat([daily, new_daily.drop(existing)]).sort_index()
+        self._daily_totals = daily.reset_index()
+        
+        # Etkilenen haftalar ve aylar yeniden toplanır, diğerleri korunur
+        affected = new_daily.index
+        if self._period_trends:
+            daily_trend = self._with_period_keys(self.calculate_daily_trends())
+            affected_keys = {'week': set(affected.isocalendar().week), 'month': set(affected.month)}
+            for period, trend in self._period_trends.items():
+                refreshed = aggregate_trend_periods(
+                    daily_trend[daily_trend[period].isin(affected_keys[period])], period)
+                trend = trend[~trend[period].isin(refreshed[period])]
+                self._period_trends[period] = pd.concat([trend, refreshed]).sort_values(period).reset_index(drop=True)
+        
+        return affected
+        
+    def observe(self, events: pd.DataFrame, time_column: str = 'date') -> Dict[str, int]:
+        """
+        Yeni olayları sadece kayan pencerelere ekle (geçmiş tablolar
+        değişmez). Sadece kova süresi time_column çözünürlüğünden ince
+        olmayan pencereler beslenir: gün bazlı tarihler saatlik pencereye
+        (dakikalık kovalar) eklenmez. Beslenen pencere başına kabul edilen
+        satır sayısını döndürür.
+        """
+        if len(events) == 0:
+            return {}
+        resolution = time_resolution(events[time_column])
+        return {name: window.update(events, time_column) for name, window in self.windows.items()
+                if window.bucket >= resolution}
+    
+    def seed_rolling_windows(self) -> None:
+        """Gün ve daha kaba kovalı pencereleri mevcut günlük toplamlardan doldur (ham tablo taranmaz)"""
+        daily_totals = self._get_daily_totals()
+        for window in self.windows.values():
+            if window.bucket % pd.Timedelta('1D') == pd.Timedelta(0):
+                window.update(daily_totals)
+    
+    def rolling_metrics(self, now=None) -> Dict[str, Dict]:
+        """
+        Her pencerenin güncel toplamları ve conversion rate'leri. now
+        verilirse pencereler önce bu zamana kaydırılır (olay gelmese de
+        eski kovalar düşer).
+        """
+        if now is not None:
+            for window in self.windows.values():
+                window.advance_to(now)
+        return {name: window.metrics() for name, window in self.windows.items()}
+        
+    @staticmethod
+    def _with_period_keys(daily_trend: pd.DataFrame) -> pd.DataFrame:
+        daily_trend['week'] = daily_trend['date'].dt.isocalendar().week
+        daily_trend['month'] = daily_trend['date'].dt.month
+        return daily_trend
         
     def calculate_daily_trends(self) -> pd.DataFrame:
         """Günlük trendleri hesapla"""
-        daily_trend = self.funnel_df.groupby('date').agg({
-            'page_view': 'sum',
-            'add_to_cart': 'sum',
-            'start_checkout': 'sum',
-            'complete_purchase': 'sum'
-        }).reset_index()
-        
+        daily_trend = self._get_daily_totals().copy()
         daily_trend['conversion_rate'] = (daily_trend['complete_purchase'] / daily_trend['page_view']) * 100
         return daily_trend
     
+    def _calculate_period_trends(self, period: str) -> pd.DataFrame:
+        if period not in self._period_trends:
+            daily_trend = self._with_period_keys(self.calculate_daily_trends())
+            self._period_trends[period] = aggregate_trend_periods(daily_trend, period)
+        return self._period_trends[period].copy()
+    
+    def calculate_weekly_trends(self) -> pd.DataFrame:
+        """Haftalık trendleri hesapla"""
+        return self._calculate_period_trends('week')
+    
     def calculate_monthly_trends(self) -> pd.DataFrame:
         """Aylık trendleri hesapla"""
-        daily_trend = self.calculate_daily_trends()
-        daily_trend['month'] = daily_trend['date'].dt.month
-        
-        monthly_trend = daily_trend.groupby('month').agg({
-            'page_view': 'sum',
-            'complete_purchase': 'sum',
-            'conversion_rate': 'mean'
-        }).reset_index()
-        
-        return monthly_trend
+        return self._calculate_period_trends('month')
@@ -0,0 +1,164 @@
+"""
+E-Ticaret Satış Analizi - Sonuç Önbelleği Modülü
+
+Türetilmiş tablolar, girdilerinin parmak izinden (dosya boyutu, mtime ve
+içerik hash'i) ve dönüşüm kodunun sürümünden oluşan bir anahtarla
+saklanır. Anahtar değişmediyse adım yeniden hesaplanmaz, çıktı dosyaları
+önbellekten geri yüklenir. Çıktılar içerik hash'iyle adlandırılan nesneler
+olarak tutulur (aynı içerik tek kopya) ve toplam boyut disk bütçesini
+aşınca en uzun süredir kullanılmayan girdiler silinir.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+CACHE_PATH = Path("data/cache")
+SRC_PATH = Path(__file__).resolve().parent
+INDEX_FILE = "index.json"
+DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+
+def file_digest(path) -> str:
+    """Dosya içeriğinin blake2b hash'i (parça parça okunur)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def code_version(paths: Iterable) -> str:
+    """Dönüşüm kodu dosyalarının içeriğinden sürüm hash'i"""
+    digest = hashlib.blake2b(digest_size=20)
+    for path in sorted(str(p) for p in paths):
+        digest.update(Path(path).name.encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+def source_version(extra_paths: Iterable = ()) -> str:
+    """src paketindeki tüm modüllerin (ve extra_paths dosyalarının) kod sürümü"""
+    return code_version([*SRC_PATH.glob("*.py"), *extra_paths])
+
+class ResultCache:
+    """Girdi parmak iziyle adreslenen, disk bütçeli çıktı dosyası önbelleği"""
+
+    def __init__(self, path=CACHE_PATH, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.path = Path(path)
+        self.objects_path = self.path / "objects"
+        self.budget_bytes = budget_bytes
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+
+        index_file = self.path / INDEX_FILE
+        index = json.loads(index_file.read_text(encoding='utf-8')) if index_file.exists() else {}
+        # digests: dosya yolu -> (size, mtime_ns, hash); boyut ve mtime değişmedikçe hash yeniden hesaplanmaz
+        self.digests: Dict[str, Dict] = index.get('digests', {})
+        # entries: anahtar -> {step, outputs: {yol: nesne hash'i}, size, last_used}
+        self.entries: Dict[str, Dict] = index.get('entries', {})
+
+    def fingerprint(self, path) -> Optional[Dict]:
+        """Dosyanın boyut, mtime ve içerik hash'i; dosya yoksa None"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        stat = path.stat()
+        known = self.digests.get(str(path))
+        if known is None or known['size'] != stat.st_size or known['mtime_ns'] != stat.st_mtime_ns:
+            known = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_digest(path)}
+            self.digests[str(path)] = known
+        return known
+
+    def key(self, step: str, inputs: Iterable, version: str) -> str:
+        """Adım adı, girdi içerik hash'leri ve kod sürümünden önbellek anahtarı"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(step.encode())
+        digest.update(version.encode())
+        for path in sorted(str(p) for p in inputs):
+            fingerprint = self.fingerprint(path)
+            digest.update(path.encode())
+            digest.update((fingerprint['hash'] if fingerprint else 'missing').encode())
+        return digest.hexdigest()
+
+    def restore(self, key: str) -> bool:
+        """
+        Anahtar önbellekteyse çıktı dosyalarını hazırla ve True döndür.
+        İçeriği zaten aynı olan çıktılara dokunulmaz, eksik veya değişmiş
+        olanlar nesne deposundan kopyalanır.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if not all((self.objects_path / digest).exists() for digest in entry['outputs'].values()):
+            self._drop(key)
+            return False
+
+        for output, digest in entry['outputs'].items():
+            current = self.fingerprint(output)
+            if current is None or current['hash'] != digest:
+                Path(output).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.objects_path / digest, output)
+                self.fingerprint(output)
+        entry['last_used'] = time.time()
+        return True
+
+    def store(self, key: str, step: str, outputs: Iterable) -> None:
+        """Adımın ürettiği çıktı dosyalarını anahtar altında sakla"""
+        stored = {}
+        for output in outputs:
+            digest = self.fingerprint(output)['hash']
+            target = self.objects_path / digest
+            if not target.exists():
+                shutil.copyfile(output, target)
+            stored[str(output)] = digest
+        self.entries[key] = {
+            'step': step,
+            'outputs': stored,
+            'size': sum((self.objects_path / digest).stat().st_size for digest in set(stored.values())),
+            'last_used': time.time()
+        }
+
+    def _drop(self, key: str) -> None:
+        """Girdiyi sil; başka girdinin kullanmadığı nesneleri de sil"""
+        entry = self.entries.pop(key)
+        in_use = {digest for other in self.entries.values() for digest in other['outputs'].values()}
+        for digest in set(entry['outputs'].values()) - in_use:
+            (self.objects_path / digest).unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.objects_path.iterdir())
+
+    def evict(self, budget_bytes: Optional[int] = None) -> List[str]:
+        """
+        Toplam boyut bütçeyi aşıyorsa girdileri sil: önce aynı adımın daha
+        yeni bir girdisi olan eski (stale) girdiler, sonra en uzun süredir
+        kullanılmayanlar. Silinen anahtarları döndür.
+        """
+        budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+        latest: Dict[str, str] = {}
+        for key, entry in self.entries.items():
+            if entry['step'] not in latest or entry['last_used'] > self.entries[latest[entry['step']]]['last_used']:
+                latest[entry['step']] = key
+
+        order = sorted(self.entries, key=lambda k: (latest[self.entries[k]['step']] == k,
+                                                    self.entries[k]['last_used']))
+        evicted = []
+        total = self.total_bytes()
+        for key in order:
+            if total <= budget_bytes:
+                break
+            self._drop(key)
+            evicted.append(key)
+            total = self.total_bytes()
+        return evicted
+
+    def save(self) -> None:
+        """İndeksi (yazıp yerine taşıyarak) kaydet; artık var olmayan dosyaların hash'leri atılır"""
+        self.digests = {path: known for path, known in self.digests.items() if os.path.exists(path)}
+        index_file = self.path / INDEX_FILE
+        tmp_file = index_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps({'digests': self.digests, 'entries': self.entries}, indent=2),
+                            encoding='utf-8')
+        tmp_file.replace(index_file)
@@ -0,0 +1,200 @@
+"""
+E-Ticaret Satış Analizi - Memory-Mapped Kolon Deposu Modülü
+
+Her kolon ayrı bir ham ikili dosyada (<kolon>.bin) saklanır, tipler ve
+kategoriler schema.json'da tutulur. Kolonlar np.memmap ile açılır: veri
+process belleğine kopyalanmaz, aynı dosyayı okuyan tüm process'ler işletim
+sisteminin sayfa önbelleğini paylaşır.
+
+Kolon türleri:
+    numeric  - dosyadaki dtype ile aynen
+    date     - 1970-01-01'den itibaren gün sayısı (int32)
+    category - kategori listesine kod (int8/int16/int32, eksik = -1)
+"""
+
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .data_loader import iter_raw_chunks
+from .storage import RAW_PATH, RAW_FILES
+
+MEMMAP_PATH = Path("data/memmap")
+SCHEMA_FILE = "schema.json"
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    """Kategori sayısına yeten en küçük işaretli tamsayı tipi (pd.Categorical ile aynı)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+class ColumnStore:
+    """Tek bir tablo için memory-mapped kolon deposu"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / SCHEMA_FILE, encoding='utf-8') as f:
+            self.schema = json.load(f)
+        self.rows: int = self.schema['rows']
+        self._columns: Dict[str, Dict] = {col['name']: col for col in self.schema['columns']}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def column_file(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def kind(self, name: str) -> str:
+        return self._columns[name]['kind']
+
+    def dtype(self, name: str) -> np.dtype:
+        return np.dtype(self._columns[name]['dtype'])
+
+    def categories(self, name: str) -> List:
+        return self._columns[name]['categories']
+
+    def stats(self, name: str) -> Dict:
+        """Kolonun min/max değerleri (date kolonlarında gün sayısı)"""
+        return {'min': self._columns[name]['min'], 'max': self._columns[name]['max']}
+
+    def column(self, name: str) -> np.ndarray:
+        """Kolonun ham değerleri (salt okunur memmap; date ve category için kodlar)"""
+        if name not in self._columns:
+            raise KeyError(f"Bilinmeyen kolon: {name}")
+        if self.rows == 0:
+            return np.empty(0, dtype=self.dtype(name))
+        return np.memmap(self.column_file(name), dtype=self.dtype(name), mode='r', shape=(self.rows,))
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Kolonları DataFrame olarak aç. Sayısal kolonlar ve category
+        kolonlarının kodları dosyaya kopyasız bağlanır (kodlar yazılırken
+        doğrulandığı için from_codes doğrulaması atlanır); sadece date
+        kolonları datetime64'e çevrilirken kopyalanır.
+        """
+        data = {}
+        for name in columns or self.columns:
+            values = self.column(name)
+            kind = self.kind(name)
+            if kind == 'date':
+                data[name] = values.astype('datetime64[D]').astype('datetime64[s]')
+            elif kind == 'category':
+                data[name] = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(self.categories(name)),
+                                                       validate=False)
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+def write_column_store(chunks: Iterable[pd.DataFrame], path, date_columns: Iterable[str] = ('date',)) -> ColumnStore:
+    """
+    DataFrame parçalarını kolon dosyalarına ekleyerek depo oluştur.
+
+    Metin ve category kolonlar parçalar arasında ortak bir kategori
+    listesine kodlanır; dosyalar önce geçici dizine yazılır, bitince
+    yerine taşınır.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+    date_columns = set(date_columns)
+
+    schema: Dict[str, Dict] = {}
+    lookups: Dict[str, Dict] = {}
+    files = {}
+    rows = 0
+    try:
+        for chunk in chunks:
+            for name in chunk.columns:
+                values = chunk[name]
+                if name not in schema:
+                    if name in date_columns:
+                        schema[name] = {'name': name, 'kind': 'date', 'dtype': '<i4'}
+                    elif isinstance(values.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(values):
+                        schema[name] = {'name': name, 'kind': 'category', 'dtype': '<i4', 'categories': []}
+                        lookups[name] = {}
+                    else:
+                        schema[name] = {'name': name, 'kind': 'numeric', 'dtype': values.dtype.str}
+                    schema[name].update({'min': None, 'max': None})
+                    files[name] = open(tmp_path / f"{name}.bin", 'wb')
+
+                column = schema[name]
+                if column['kind'] == 'date':
+                    array = pd.to_datetime(values).to_numpy().astype('datetime64[D]').astype(np.int32)
+                elif column['kind'] == 'category':
+                    # Parçanın kendi kategorileri ortak listeye eşlenir
+                    local = pd.Categorical(values)
+                    lookup = lookups[name]
+                    for category in local.categories:
+                        if category not in lookup:
+                            lookup[category] = len(lookup)
+                            column['categories'].append(category)
+                    mapping = np.array([lookup[c] for c in local.categories] + [-1], dtype=np.int32)
+                    array = mapping[local.codes]
+                else:
+                    array = values.to_numpy().astype(column['dtype'], copy=False)
+
+                if len(array) and column['kind'] != 'category':
+                    low, high = array.min().item(), array.max().item()
+                    column['min'] = low if column['min'] is None else min(column['min'], low)
+                    column['max'] = high if column['max'] is None else max(column['max'], high)
+                files[name].write(np.ascontiguousarray(array).tobytes())
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    # Kategori kodları kategori sayısına yeten en küçük tipe daraltılır
+    for column in schema.values():
+        if column['kind'] == 'category':
+            dtype = _code_dtype(len(column['categories']))
+            if dtype != np.int32:
+                codes = np.fromfile(tmp_path / f"{column['name']}.bin", dtype=np.int32)
+                codes.astype(dtype).tofile(tmp_path / f"{column['name']}.bin")
+            column['dtype'] = dtype.str
+            column['categories'] = [c.item() if isinstance(c, np.generic) else c for c in column['categories']]
+
+    with open(tmp_path / SCHEMA_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'rows': rows, 'columns': list(schema.values())}, f, ensure_ascii=False, indent=2)
+
+    # Eski depo önce kenara alınır, yenisi yerine taşınır, sonra eskisi silinir;
+    # arada kesilirse eski depo .old dizininde durur
+    old_path = path.with_name(path.name + ".old")
+    if old_path.exists():
+        shutil.rmtree(old_path)
+    if path.exists():
+        path.rename(old_path)
+    tmp_path.rename(path)
+    if old_path.exists():
+        shutil.rmtree(old_path)
+    return ColumnStore(path)
+
+def is_column_store_fresh(name: str, raw_path: Path = RAW_PATH, store_path: Path = MEMMAP_PATH) -> bool:
+    """Kolon deposu var ve ham CSV'den daha yeni mi?"""
+    schema_file = Path(store_path) / name / SCHEMA_FILE
+    csv_file = Path(raw_path) / RAW_FILES[name]
+    if not schema_file.exists():
+        return False
+    if not csv_file.exists():
+        return True
+    return schema_file.stat().st_mtime >= csv_file.stat().st_mtime
+
+def open_column_store(name: str = 'funnel', store_path: Path = MEMMAP_PATH, force: bool = False) -> ColumnStore:
+    """
+    Veri setinin kolon deposunu aç; yoksa veya ham veriden eskiyse ham
+    veriden (Parquet deposu güncelse oradan) parça parça oluştur.
+    """
+    path = Path(store_path) / name
+    if force or not is_column_store_fresh(name, store_path=store_path):
+        return write_column_store(iter_raw_chunks(name, compact=True), path)
+    return ColumnStore(path)
+
+if __name__ == "__main__":
+    store = open_column_store('funnel', force=True)
+    print(f"✅ funnel -> {store.path} ({store.rows:,} satır, {len(store.columns)} kolon)")
@@ -0,0 +1,116 @@
+"""
+E-Ticaret Satış Analizi - Funnel Küpü Modülü
+
+Session tablosu bir kez date x category x device_type x source boyutlarında
+aşama toplamlarına indirilir. Her kırılım (kategori, cihaz, kaynak funnel'i,
+kategori x tarih trendi) ham tablo yerine bu küçük küpten hesaplanır.
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .analyzer import FunnelAnalyzer, TrendAnalyzer, STAGE_COLUMNS
+
+DIMENSIONS = ['date', 'category', 'device_type', 'source']
+MEASURES = list(STAGE_COLUMNS.values())
+
+class FunnelCube:
+    """Önceden toplanmış funnel küpü ve dilim/roll-up sorguları"""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table
+
+    @staticmethod
+    def _aggregate(df: pd.DataFrame) -> pd.DataFrame:
+        dimensions = [col for col in DIMENSIONS if col in df.columns]
+        # Ölçüler girdi tipinden (kompakt uint8 vb.) bağımsız olarak int64
+        cube = df.groupby(dimensions, observed=True)[MEASURES].sum().astype(np.int64).reset_index()
+        for col in dimensions:
+            if col != 'date':
+                cube[col] = cube[col].astype('category')
+        return cube
+
+    @classmethod
+    def from_frame(cls, funnel_df: pd.DataFrame) -> 'FunnelCube':
+        """Session tablosundan küp oluştur"""
+        return cls(cls._aggregate(funnel_df))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> 'FunnelCube':
+        """
+        Parça iteratöründen küp oluştur. Her parça ayrı toplanır, kısmi
+        küpler sonda tek seferde birleştirilir; bellek parça başına küp
+        boyutuyla sınırlıdır.
+        """
+        partials = [cls._aggregate(chunk) for chunk in chunks]
+        if not partials:
+            return cls(pd.DataFrame(columns=DIMENSIONS + MEASURES))
+        if len(partials) == 1:
+            return cls(partials[0])
+        return cls(cls._aggregate(pd.concat(partials, ignore_index=True)))
+
+    @classmethod
+    def load(cls, path) -> 'FunnelCube':
+        return cls(pd.read_parquet(path))
+
+    def save(self, path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.table.to_parquet(path, index=False)
+
+    def _mask(self, filters: Dict) -> np.ndarray:
+        """
+        Filtre maskesi. Değer tek bir değer, değer listesi veya 'date' için
+        (başlangıç, bitiş) kapalı aralığı olabilir.
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        for col, value in filters.items():
+            if col not in DIMENSIONS:
+                raise KeyError(f"Bilinmeyen boyut: {col}")
+            values = self.table[col]
+            if col == 'date' and isinstance(value, tuple):
+                start, end = value
+                if start is not None:
+                    mask &= (values >= pd.Timestamp(start)).to_numpy()
+                if end is not None:
+                    mask &= (values <= pd.Timestamp(end)).to_numpy()
+            elif isinstance(value, (list, set, frozenset)):
+                mask &= values.isin(list(value)).to_numpy()
+            else:
+                mask &= (values == value).to_numpy()
+        return mask
+
+    def slice(self, **filters) -> 'FunnelCube':
+        """Filtrelenmiş alt küp"""
+        if not filters:
+            return self
+        return FunnelCube(self.table[self._mask(filters)].reset_index(drop=True))
+
+    def rollup(self, by: Optional[Sequence[str]] = None, **filters) -> pd.DataFrame:
+        """
+        Küpü verilen boyutlara topla (by boşsa genel toplam).
+
+        Örnek: cube.rollup(['device_type'], category='Elektronik',
+        date=('2024-03-01', '2024-03-31'))
+        """
+        table = self.slice(**filters).table
+        by = list(by or [])
+        for col in by:
+            if col not in DIMENSIONS:
+                raise KeyError(f"Bilinmeyen boyut: {col}")
+
+        if by:
+            result = table.groupby(by, observed=True)[MEASURES].sum().reset_index()
+        else:
+            result = pd.DataFrame([table[MEASURES].to_numpy(dtype=np.int64).sum(axis=0)], columns=MEASURES)
+        result['conversion_rate'] = (result['complete_purchase'] / result['page_view']) * 100
+        return result
+
+    def funnel_analyzer(self, **filters) -> FunnelAnalyzer:
+        """Küp (veya dilimi) üzerinde FunnelAnalyzer; küp satırları ham satırlarla aynı toplamları verir"""
+        return FunnelAnalyzer(self.slice(**filters).table)
+
+    def trend_analyzer(self, **filters) -> TrendAnalyzer:
+        """Küp (veya dilimi) üzerinde TrendAnalyzer"""
+        return TrendAnalyzer(self.slice(**filters).table)
@@ -2,37 +2,175 @@
 E-Ticaret Satış Analizi - Veri Yükleme Modülü
 """
 
+import operator
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-def load_raw_data():
-    """Ham veri setlerini yükle"""
-    data_path = Path("data/raw")
-    
-    # Funnel verisi
-    funnel_df = pd.read_csv(data_path / "funnel_data.csv")
-    funnel_df['date'] = pd.to_datetime(funnel_df['date'])
-    
-    # Kullanıcı davranışı
-    behavior_df = pd.read_csv(data_path / "user_behavior.csv")
-    behavior_df['date'] = pd.to_datetime(behavior_df['date'])
-    
-    # RFM verisi
-    rfm_df = pd.read_csv(data_path / "rfm_data.csv")
-    
-    # E-ticaret satış verisi
-    sales_df = pd.read_csv(data_path / "ecommerce_sales.csv")
-    
-    return {
-        'funnel': funnel_df,
-        'behavior': behavior_df,
-        'rfm': rfm_df,
-        'sales': sales_df
+from .storage import (RAW_FILES, DATE_COLUMNS, is_store_fresh, read_dataset, iter_dataset_batches,
+                      normalize_filters, date_range_filters)
+
+COMPARISON_OPS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge
+}
+
+# Funnel aşama bayrakları (0/1)
+STAGE_FLAG_COLUMNS = ['page_view', 'add_to_cart', 'start_checkout', 'complete_purchase']
+
+# Kompakt yükleme şeması: bayraklar uint8, düşük kardinaliteli metinler category
+COMPACT_DTYPES = {
+    'funnel': {
+        **{col: 'uint8' for col in STAGE_FLAG_COLUMNS},
+        'session_id': 'uint32',
+        'user_id': 'category',
+        'product_id': 'category',
+        'category': 'category',
+        'device_type': 'category',
+        'source': 'category'
     }
+}
+
+# Önekli kimlikler ('user_1234', 'prod_456') tamsayı koda çevrilir
+ID_PREFIXES = {
+    'funnel': {'user_id': 'user_', 'product_id': 'prod_'}
+}
+
+def _decode_prefixed_ids(values, prefix):
+    """Önekli kimlikleri tamsayıya çevir; sadece benzersiz değerler parse edilir"""
+    codes = values.astype('category').cat
+    ids = codes.categories.str.slice(len(prefix)).astype(np.uint32).to_numpy()
+    return ids[codes.codes.to_numpy()]
+
+def _compact(name, df):
+    """Veri setini kompakt şemaya dönüştür"""
+    for col, dtype in COMPACT_DTYPES.get(name, {}).items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    for col, prefix in ID_PREFIXES.get(name, {}).items():
+        if col in df.columns:
+            df[col] = _decode_prefixed_ids(df[col], prefix)
+    return df
+
+def _dictionary_columns(name):
+    """Parquet'ten sözlük olarak okunacak kompakt metin kolonları"""
+    return [col for col, dtype in COMPACT_DTYPES.get(name, {}).items() if dtype == 'category']
+
+def pack_stages(funnel_df):
+    """Dört aşama bayrağını tek bir uint8 kolonuna (stage_bits) paketle"""
+    bits = np.zeros(len(funnel_df), dtype=np.uint8)
+    for i, col in enumerate(STAGE_FLAG_COLUMNS):
+        bits |= funnel_df[col].to_numpy(dtype=np.uint8) << i
+    packed = funnel_df.drop(columns=STAGE_FLAG_COLUMNS)
+    packed['stage_bits'] = bits
+    return packed
+
+def unpack_stages(packed_df):
+    """stage_bits kolonunu dört aşama bayrağına geri aç"""
+    funnel_df = packed_df.drop(columns=['stage_bits'])
+    bits = packed_df['stage_bits'].to_numpy()
+    for i, col in enumerate(STAGE_FLAG_COLUMNS):
+        funnel_df[col] = (bits >> i) & 1
+    return funnel_df
+
+def apply_filters(df, filters):
+    """(kolon, operatör, değer) filtrelerini bellekteki tabloya uygula (CSV yolu)"""
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        values = df[column]
+        if op == 'in':
+            mask &= values.isin(value).to_numpy()
+        elif op == 'not in':
+            mask &= ~values.isin(value).to_numpy()
+        else:
+            mask &= COMPARISON_OPS[op](values, value).to_numpy()
+    return df[mask].reset_index(drop=True)
+
+def _load_raw_csv(name, columns=None, date_range=None, compact=False, filters=None):
+    """Tek bir ham veri setini CSV'den yükle"""
+    data_path = Path("data/raw")
+    filters = date_range_filters(name, date_range) + normalize_filters(name, filters)
+
+    # Filtre kolonları okunur, süzme sonrası bırakılır
+    usecols = columns
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + [column for column, _, _ in filters]))
+
+    dtype = COMPACT_DTYPES.get(name) if compact else None
+    df = pd.read_csv(data_path / RAW_FILES[name], usecols=usecols, dtype=dtype)
+    for col in DATE_COLUMNS.get(name, []):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+
+    df = apply_filters(df, filters)
+    if filters:
+        # Parquet yolundaki gibi kategoriler sadece süzme sonrası kalan değerlerdir
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.remove_unused_categories()
+    if columns is not None and len(usecols) > len(columns):
+        df = df[list(columns)]
+    return df
+
+def load_raw_data(datasets=None, columns=None, date_range=None, use_store=True, compact=False,
+                  filters=None):
+    """
+    Ham veri setlerini yükle
+
+    datasets: yüklenecek veri setleri (varsayılan: funnel, behavior, rfm, sales)
+    columns: veri seti adı -> okunacak kolonlar
+    date_range: (başlangıç, bitiş); `date` kolonu olan veri setlerine uygulanır
+    use_store: data/columnar altında güncel Parquet varsa oradan oku
+    compact: COMPACT_DTYPES şemasını uygula (uint8 bayraklar, category
+    metinler, tamsayı kimlikler)
+    filters: veri seti adı -> (kolon, operatör, değer) listesi; Parquet
+    okunurken row group'lara itilir
+    """
+    columns = columns or {}
+    filters = filters or {}
+
+    data = {}
+    for name in datasets or RAW_FILES:
+        if use_store and is_store_fresh(name):
+            dictionary_columns = _dictionary_columns(name) if compact else None
+            df = read_dataset(name, columns=columns.get(name), date_range=date_range,
+                              dictionary_columns=dictionary_columns, filters=filters.get(name))
+        else:
+            df = _load_raw_csv(name, columns=columns.get(name), date_range=date_range, compact=compact,
+                               filters=filters.get(name))
+        data[name] = _compact(name, df) if compact else df
+
+    return data
+
+def iter_raw_chunks(name, columns=None, chunk_rows=1_000_000, use_store=True, compact=False):
+    """
+    Ham veri setini parça parça oku (akış modundaki analizler için)
+
+    Parquet deposu güncelse row group'lar, değilse CSV chunksize kullanılır.
+    """
+    if use_store and is_store_fresh(name):
+        dictionary_columns = _dictionary_columns(name) if compact else None
+        for chunk in iter_dataset_batches(name, columns=columns, batch_size=chunk_rows,
+                                          dictionary_columns=dictionary_columns):
+            yield _compact(name, chunk) if compact else chunk
+        return
+
+    dtype = COMPACT_DTYPES.get(name) if compact else None
+    for chunk in pd.read_csv(Path("data/raw") / RAW_FILES[name], usecols=columns, dtype=dtype,
+                             chunksize=chunk_rows):
+        for col in DATE_COLUMNS.get(name, []):
+            if col in chunk.columns:
+                chunk[col] = pd.to_datetime(chunk[col])
+        yield _compact(name, chunk) if compact else chunk
+
+# Processed CSV yolu -> ((boyut, mtime_ns), DataFrame); değişmeyen dosya yeniden parse edilmez
+_processed_cache = {}
 
 def load_processed_data():
-    """İşlenmiş veri setlerini yükle"""
+    """İşlenmiş veri setlerini yükle (değişmemiş dosyalar bellekteki kopyadan)"""
     data_path = Path("data/processed")
     
     processed_data = {}
@@ -40,13 +178,19 @@ def load_processed_data():
     # Processed dosyaları yükle
     for file in data_path.glob("*.csv"):
         name = file.stem
-        processed_data[name] = pd.read_csv(file)
+        stat = file.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = _processed_cache.get(file)
+        if cached is None or cached[0] != signature:
+            cached = (signature, pd.read_csv(file))
+            _processed_cache[file] = cached
+        processed_data[name] = cached[1].copy()
     
     return processed_data
 
-def get_data_info():
+def get_data_info(compact=False):
     """Veri setleri hakkında bilgi"""
-    raw_data = load_raw_data()
+    raw_data = load_raw_data(compact=compact)
     
     info = {}
     for name, df in raw_data.items():
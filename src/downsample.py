@@ -0,0 +1,108 @@
+"""
+E-Ticaret Satış Analizi - Sunucu Tarafı Örnekleme (Downsampling) Modülü
+
+Grafiğe giden nokta sayısını girdi boyutundan bağımsız olarak sınırlar:
+çizgi serileri LTTB (Largest-Triangle-Three-Buckets) ile görsel şekli
+koruyarak seyreltilir, scatter verisi ise segment bazında 2D ızgara
+hücrelerine toplanır (hücre başına sayı ve ortalamalar).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from .analyzer import group_codes
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    LTTB ile seçilen noktaların indeksleri (x artan sırada olmalı).
+
+    İlk ve son nokta korunur; aradaki noktalar n_out - 2 kovaya bölünür ve
+    her kovadan, önceki seçilen nokta ile sonraki kovanın ortalaması
+    arasında en büyük üçgeni oluşturan nokta seçilir. Döngü kova sayısı
+    kadardır, her kova içi NumPy ile hesaplanır.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Sonraki kovanın ortalaması (son kovada son nokta)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+def lttb(df: pd.DataFrame, x: str, y: str, n_out: int) -> pd.DataFrame:
+    """
+    Tabloyu x kolonuna göre sıralayıp LTTB ile n_out satıra indir. y değeri
+    eksik (NaN) satırlar seçime katılmaz.
+    """
+    df = df[df[y].notna()]
+    if not df[x].is_monotonic_increasing:
+        df = df.sort_values(x)
+    x_values = df[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('datetime64[ns]').astype(np.int64)
+    return df.iloc[lttb_indices(x_values, df[y].to_numpy(), n_out)]
+
+def _grid_codes(values: np.ndarray, bins: int) -> np.ndarray:
+    """Değerleri eşit genişlikli bins aralığa böl (0..bins-1)"""
+    low, high = np.nanmin(values), np.nanmax(values)
+    if high <= low:
+        return np.zeros(len(values), dtype=np.intp)
+    codes = ((values - low) * (bins / (high - low))).astype(np.intp)
+    return np.minimum(codes, bins - 1)
+
+def bin_scatter(df: pd.DataFrame, x: str, y: str, group: Optional[str] = None,
+                size: Optional[str] = None, bins: Tuple[int, int] = (120, 80)) -> pd.DataFrame:
+    """
+    Noktaları (grup, x hücresi, y hücresi) bazında topla. Her dolu hücre tek
+    satırdır: x/y hücredeki noktaların ortalama konumu, count nokta sayısı,
+    size verilmişse o kolonun hücre ortalaması. Satır sayısı en fazla
+    grup sayısı x bins[0] x bins[1] olur.
+    """
+    df = df[df[x].notna() & df[y].notna()]
+    x_values = df[x].to_numpy(dtype=np.float64)
+    y_values = df[y].to_numpy(dtype=np.float64)
+    x_bins, y_bins = bins
+    cells = _grid_codes(x_values, x_bins) * y_bins + _grid_codes(y_values, y_bins)
+    n_cells = x_bins * y_bins
+
+    if group is not None:
+        codes, labels = group_codes(df[group])
+        keep = codes >= 0
+        cells = codes[keep].astype(np.intp) * n_cells + cells[keep]
+        x_values, y_values = x_values[keep], y_values[keep]
+        n_cells *= len(labels)
+    else:
+        keep = slice(None)
+
+    counts = np.bincount(cells, minlength=n_cells)
+    occupied = np.flatnonzero(counts)
+    totals = counts[occupied]
+
+    result = pd.DataFrame({
+        x: np.bincount(cells, weights=x_values, minlength=n_cells)[occupied] / totals,
+        y: np.bincount(cells, weights=y_values, minlength=n_cells)[occupied] / totals,
+        'count': totals
+    })
+    if size is not None:
+        size_values = df[size].to_numpy(dtype=np.float64)[keep]
+        result[size] = np.bincount(cells, weights=size_values, minlength=n_cells)[occupied] / totals
+    if group is not None:
+        result.insert(0, group, labels[occupied // (x_bins * y_bins)])
+    return result
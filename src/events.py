@@ -0,0 +1,157 @@
+"""
+E-Ticaret Satış Analizi - Olay Akışı Funnel Modülü
+
+(session_id, timestamp, event_type) olay akışını session bazında funnel
+bayraklarına (page_view, add_to_cart, start_checkout, complete_purchase)
+çevirir. Aşama sırası ve funnel başlangıcından itibaren zaman penceresi
+uygulanır. Session başına Python döngüsü yoktur: akış (session, zaman)
+sırasında olduğundan her olayın global sırası hem session'ı hem zamanı
+kodlar ve her aşama, bir önceki aşamanın eşleştiği olaydan sonraki ilk
+olay olarak np.searchsorted ile bulunur.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional
+
+from .analyzer import FunnelAnalyzer, STAGE_COLUMNS
+
+class EventFunnelEngine:
+    """Olay akışından session funnel'i çıkaran motor"""
+
+    def __init__(self, window: Optional[str] = None, session_col: str = 'session_id',
+                 time_col: str = 'timestamp', event_col: str = 'event_type',
+                 carry_columns: Iterable[str] = ()):
+        """
+        window: funnel başlangıcından (ilk page_view) sonra sonraki aşamalar
+        için izin verilen süre (örn. '30min'); None ise session içinde sınırsız.
+        carry_columns: funnel başlangıç olayından çıktıya taşınacak kolonlar
+        (örn. category, device_type).
+        """
+        self.window = None if window is None else pd.Timedelta(window)
+        self.session_col = session_col
+        self.time_col = time_col
+        self.event_col = event_col
+        self.carry_columns = list(carry_columns)
+        self.stages = list(STAGE_COLUMNS.values())
+
+    def _sorted(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Akış (session, zaman) sırasında değilse kararlı sırala"""
+        sessions = events[self.session_col].to_numpy()
+        times = pd.to_datetime(events[self.time_col]).to_numpy()
+        if len(events) < 2:
+            return events
+        same = sessions[1:] == sessions[:-1]
+        if np.all((sessions[1:] >= sessions[:-1]) & (~same | (times[1:] >= times[:-1]))):
+            return events
+        order = np.lexsort((times, sessions))
+        return events.iloc[order].reset_index(drop=True)
+
+    def sessionize(self, events: pd.DataFrame) -> pd.DataFrame:
+        """
+        Olay tablosunu session başına tek satıra indir: session_id, date
+        (funnel başlangıç günü), carry_columns ve 0/1 aşama bayrakları.
+        page_view olayı olmayan session'lar funnel'e girmez (tüm bayraklar 0).
+        """
+        events = self._sorted(events)
+        n_events = len(events)
+        sessions = events[self.session_col].to_numpy()
+        times = pd.to_datetime(events[self.time_col]).to_numpy().astype('datetime64[ns]').astype(np.int64)
+        # Olay tipleri aşama indeksine çevrilir (aşama dışı olaylar -1)
+        event_codes = pd.Index(self.stages).get_indexer(events[self.event_col])
+
+        # Sıralı akışta session kodları değişim noktalarının kümülatif toplamıdır
+        changes = np.ones(n_events, dtype=bool)
+        changes[1:] = sessions[1:] != sessions[:-1]
+        starts = np.flatnonzero(changes)
+        session_codes = np.cumsum(changes) - 1
+        n_sessions = len(starts)
+
+        flags = np.zeros((n_sessions, len(self.stages)), dtype=np.uint8)
+        first_view = np.full(n_sessions, -1, dtype=np.int64)
+
+        # Aşama 0: session'daki ilk page_view olayı
+        views = np.flatnonzero(event_codes == 0)
+        view_sessions = session_codes[views]
+        first = np.ones(len(views), dtype=bool)
+        first[1:] = view_sessions[1:] != view_sessions[:-1]
+        active = view_sessions[first]
+        matched = views[first]
+        first_view[active] = matched
+        flags[active, 0] = 1
+
+        deadline = times[matched] + self.window.value if self.window is not None else None
+
+        # Sonraki aşamalar: önceki eşleşmeden sonraki ilk olay, aynı session ve pencere içinde
+        for j in range(1, len(self.stages)):
+            if len(active) == 0:
+                break
+            candidates = np.flatnonzero(event_codes == j)
+            if len(candidates) == 0:
+                break
+            positions = np.searchsorted(candidates, matched, side='right')
+            found = positions < len(candidates)
+            next_event = candidates[np.minimum(positions, len(candidates) - 1)]
+            found &= session_codes[next_event] == active
+            if deadline is not None:
+                found &= times[next_event] <= deadline
+
+            active = active[found]
+            matched = next_event[found]
+            if deadline is not None:
+                deadline = deadline[found]
+            flags[active, j] = 1
+
+        result = pd.DataFrame({self.session_col: sessions[starts]})
+        start_rows = np.where(first_view >= 0, first_view, starts)
+        result['date'] = pd.to_datetime(times[start_rows]).normalize()
+        for col in self.carry_columns:
+            result[col] = events[col].to_numpy()[start_rows]
+        for j, stage in enumerate(self.stages):
+            result[stage] = flags[:, j]
+        return result
+
+    def iter_sessionize(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Sıralı olay akışını parça parça işle. Parça sınırında kesilen son
+        session'ın olayları bir sonraki parçaya taşınır, bu yüzden her
+        session tam olarak bir kez ve tüm olaylarıyla işlenir.
+        """
+        carry: Optional[pd.DataFrame] = None
+        for chunk in chunks:
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            if len(chunk) == 0:
+                continue
+            sessions = chunk[self.session_col].to_numpy()
+            others = np.flatnonzero(sessions != sessions[-1])
+            tail_start = int(others[-1]) + 1 if len(others) else 0
+            carry = chunk.iloc[tail_start:]
+            if tail_start:
+                yield self.sessionize(chunk.iloc[:tail_start])
+        if carry is not None and len(carry):
+            yield self.sessionize(carry)
+
+    def funnel_analyzer(self, chunks: Iterable[pd.DataFrame], group_by: Iterable[str] = ()) -> FunnelAnalyzer:
+        """Olay akışı üzerinde akış modundaki FunnelAnalyzer (session bayrakları belleğe alınmaz)"""
+        return FunnelAnalyzer.from_chunks(self.iter_sessionize(chunks), group_by=group_by)
+
+def flags_to_events(funnel_df: pd.DataFrame, session_col: str = 'session_id',
+                    step: str = '1min', carry_columns: List[str] = ()) -> pd.DataFrame:
+    """
+    Session bayrak tablosunu (funnel_data.csv) sıralı olay akışına çevir;
+    her ulaşılan aşama için bir olay, aşamalar arası step kadar süreyle.
+    Ters yönde doğrulama ve test verisi üretimi içindir.
+    """
+    stages = list(STAGE_COLUMNS.values())
+    flags = funnel_df[stages].to_numpy().astype(bool)
+    rows, stage_idx = np.nonzero(flags)
+    start = pd.to_datetime(funnel_df['date']).to_numpy().astype('datetime64[ns]')
+    events = pd.DataFrame({
+        session_col: funnel_df[session_col].to_numpy()[rows],
+        'timestamp': start[rows] + stage_idx * pd.Timedelta(step).to_timedelta64(),
+        'event_type': np.array(stages, dtype=object)[stage_idx]
+    })
+    for col in carry_columns:
+        events[col] = funnel_df[col].to_numpy()[rows]
+    return events
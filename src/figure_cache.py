@@ -0,0 +1,136 @@
+"""
+E-Ticaret Satış Analizi - Figür Önbelleği Modülü
+
+Görselleştirme fonksiyonlarının ürettiği Plotly figürleri, girdi verisinin
+hash'i, fonksiyon parametreleri ve src kodunun sürümünden oluşan
+bir anahtarla diskte JSON olarak saklanır. Aynı girdiyle tekrar çağrıldığında
+figür yeniden oluşturulmaz; toplam boyut bütçeyi aşınca en uzun süredir
+kullanılmayan figürler silinir (LRU, dosya mtime'ı ile).
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache import CACHE_PATH, source_version
+
+FIGURE_CACHE_PATH = CACHE_PATH / "figures"
+DEFAULT_FIGURE_BUDGET_BYTES = 256 * 1024 * 1024
+
+def hash_input(value, digest=None) -> str:
+    """DataFrame/Series/dizi/dict/skaler girdinin içerik hash'i"""
+    digest = digest or hashlib.blake2b(digest_size=20)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+            digest.update(repr(value.dtypes.astype(str).tolist()).encode())
+        else:
+            digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+class FigureCache:
+    """Disk üzerinde LRU figür önbelleği"""
+
+    def __init__(self, path=FIGURE_CACHE_PATH, budget_bytes: int = DEFAULT_FIGURE_BUDGET_BYTES):
+        self.path = Path(path)
+        self.budget_bytes = budget_bytes
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def key(self, func: Callable, args: tuple, kwargs: dict) -> str:
+        """
+        Fonksiyon, kod sürümü, Plotly sürümü, girdiler ve parametrelerden
+        anahtar. Kod sürümü src paketinin tüm modüllerini kapsar (figür
+        içeriğini downsample gibi yardımcı modüller de belirler).
+        """
+        import plotly
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(func.__qualname__.encode())
+        digest.update(source_version().encode())
+        digest.update(plotly.__version__.encode())
+        for value in args:
+            digest.update(hash_input(value).encode())
+        for name in sorted(kwargs):
+            digest.update(name.encode())
+            digest.update(hash_input(kwargs[name]).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Önbellekteki figür (yoksa None); erişim zamanı LRU için güncellenir"""
+        import plotly.io as pio
+        file = self.path / f"{key}.json"
+        try:
+            text = file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+        os.utime(file)
+        return pio.from_json(text)
+
+    def put(self, key: str, fig) -> None:
+        """Figürü yaz (geçici dosyaya yazıp yerine taşıyarak) ve bütçeyi uygula"""
+        file = self.path / f"{key}.json"
+        tmp_file = file.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp_file.write_text(fig.to_json(), encoding='utf-8')
+        tmp_file.replace(file)
+        self.evict()
+
+    def evict(self, budget_bytes: Optional[int] = None) -> int:
+        """En uzun süredir kullanılmayan figürleri bütçeye inene kadar sil; silinen sayısını döndür"""
+        budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+        files = []
+        for file in self.path.glob("*.json"):
+            try:
+                files.append((file.stat().st_mtime, file.stat().st_size, file))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, file in sorted(files):
+            if total <= budget_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for file in self.path.glob("*.json"):
+            file.unlink(missing_ok=True)
+
+# Görselleştirme sınıflarının kullandığı önbellek; None ise önbellek kapalı
+_figure_cache: Optional[FigureCache] = None
+
+def set_figure_cache(cache: Optional[FigureCache]) -> None:
+    """Figür önbelleğini etkinleştir (FigureCache) veya kapat (None)"""
+    global _figure_cache
+    _figure_cache = cache
+
+def get_figure_cache() -> Optional[FigureCache]:
+    return _figure_cache
+
+def cached_figure(func: Callable) -> Callable:
+    """Figür üreten fonksiyonun sonucunu etkin figür önbelleğinde sakla"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _figure_cache
+        if cache is None:
+            return func(*args, **kwargs)
+        key = cache.key(func, args, kwargs)
+        fig = cache.get(key)
+        if fig is None:
+            fig = func(*args, **kwargs)
+            cache.put(key, fig)
+        return fig
+    return wrapper
@@ -0,0 +1,229 @@
+"""
+E-Ticaret Satış Analizi - Bölümlenmiş Paralel Toplama Modülü
+
+Funnel tablosunun tarih ve grup kolonları tamsayı kodlara, aşama kolonları
+ham dizilere çevrilip paylaşımlı belleğe (shared memory) kopyalanır.
+Tablo tarih aralıklarına bölünür; her bölüm bir process'te sadece kendi
+satır aralığını okuyarak gün x grup hücreleri için kısmi toplamları
+np.bincount ile hesaplar. Process'lere DataFrame değil sadece bellek blok
+adları gönderilir; ana process küçük kısmi toplam dizilerini birleştirir.
+Kolon deposu (column_store) kullanıldığında kopyalama da yapılmaz, her
+process kolon dosyalarını doğrudan memmap ile açar.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .analyzer import (FunnelAnalyzer, StreamingFunnelAggregator, TrendAnalyzer,
+                       STAGE_COLUMNS, group_codes)
+from .column_store import ColumnStore
+
+# Bu satır sayısının altında bölümleme maliyeti kazançtan büyüktür
+MIN_ROWS_PER_SHARD = 250_000
+
+# Gün x grup hücre tablosunun üst sınırı (yüksek kardinaliteli group_by kolonlarına karşı)
+MAX_CELLS = 10_000_000
+
+def _share(array: np.ndarray, blocks: List[SharedMemory]) -> Tuple:
+    """Diziyi yeni bir paylaşımlı bellek bloğuna kopyala; worker'lar için tanım döndür"""
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return 'shm', block.name, array.dtype.str, array.shape
+
+def _mapped(store: ColumnStore, name: str) -> Tuple:
+    """Kolon deposundaki dosya için worker tanımı (kopyalama yok)"""
+    return 'file', str(store.column_file(name).resolve()), store.dtype(name).str, (store.rows,)
+
+def _attach(spec: Tuple) -> Tuple[Optional[SharedMemory], np.ndarray]:
+    """Bloğa veya dosyaya bağlan (kopyasız görünüm); bloğu silmek ana process'in işidir"""
+    source, location, dtype, shape = spec
+    if source == 'file':
+        if shape[0] == 0:
+            return None, np.empty(0, dtype=np.dtype(dtype))
+        return None, np.memmap(location, dtype=np.dtype(dtype), mode='r', shape=shape)
+    block = SharedMemory(name=location)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+def _aggregate_shard(specs: Dict, offsets: Dict[str, int], cell_shape: Tuple[int, ...],
+                     start: int, stop: int) -> np.ndarray:
+    """
+    Bir satır aralığı için (gün, grup1, grup2, ...) hücre bazında satır sayısı
+    ve aşama toplamları. Gün ve grup toplamları bu küçük tablodan türetilir,
+    böylece her aşama için tek bir bincount yeterlidir. Kodlara offsets
+    eklenerek 0 tabanlı indekse çevrilir (gün: -ilk gün, grup: +1, eksik
+    anahtar 0 hücresine düşer).
+    """
+    blocks = []
+    try:
+        cells = None
+        for key, size in zip(['day'] + list(specs['groups']), cell_shape):
+            block, codes = _attach(specs['day'] if key == 'day' else specs['groups'][key])
+            blocks.append(block)
+            codes = codes[start:stop].astype(np.intp) + offsets[key]
+            cells = codes if cells is None else cells * size + codes
+
+        n_cells = int(np.prod(cell_shape))
+        totals = np.empty((n_cells, len(STAGE_COLUMNS) + 1), dtype=np.int64)
+        totals[:, 0] = np.bincount(cells, minlength=n_cells)
+        for j, col in enumerate(STAGE_COLUMNS.values()):
+            block, values = _attach(specs['stages'][col])
+            blocks.append(block)
+            totals[:, j + 1] = np.bincount(cells, weights=values[start:stop], minlength=n_cells)
+        return totals
+    finally:
+        for block in blocks:
+            if block is not None:
+                block.close()
+
+def _run_shards(specs: Dict, offsets: Dict[str, int], cell_shape: Tuple[int, ...],
+                bounds: List[Tuple[int, int]]) -> np.ndarray:
+    """Bölümleri (birden fazlaysa process havuzunda) topla ve kısmi tabloları birleştir"""
+    if np.prod(cell_shape, dtype=np.float64) > MAX_CELLS:
+        raise ValueError(f"Gün x grup hücre sayısı çok büyük: {cell_shape}; daha az group_by kolonu kullanın")
+
+    if len(bounds) <= 1:
+        partials = [_aggregate_shard(specs, offsets, cell_shape, start, stop) for start, stop in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=len(bounds)) as executor:
+            futures = [executor.submit(_aggregate_shard, specs, offsets, cell_shape, start, stop)
+                       for start, stop in bounds]
+            partials = [future.result() for future in futures]
+
+    cells = sum(partials) if partials else np.zeros((int(np.prod(cell_shape)), len(STAGE_COLUMNS) + 1),
+                                                    dtype=np.int64)
+    return cells.reshape(cell_shape + (len(STAGE_COLUMNS) + 1,))
+
+def shard_bounds(days: np.ndarray, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Satırları n_shards parçaya böl. Tablo tarihe göre sıralıysa sınırlar gün
+    başlangıçlarına hizalanır (her gün tek bir bölümde kalır); değilse eşit
+    satır aralıkları kullanılır. Toplamlar her iki durumda da doğrudur.
+    """
+    n_rows = len(days)
+    cuts = np.linspace(0, n_rows, n_shards + 1).astype(np.int64)
+    if n_rows and np.all(days[1:] >= days[:-1]):
+        cuts = np.searchsorted(days, days[np.minimum(cuts, n_rows - 1)], side='left')
+        cuts[0], cuts[-1] = 0, n_rows
+    cuts = np.unique(cuts)
+    return [(int(start), int(stop)) for start, stop in zip(cuts[:-1], cuts[1:])]
+
+class PartitionedFunnel:
+    """Paralel hesaplanmış gün ve grup bazlı aşama toplamları"""
+
+    def __init__(self, daily_totals: pd.DataFrame, group_totals: Dict[str, pd.DataFrame], rows: int):
+        self.daily_totals = daily_totals
+        self.group_totals = group_totals
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, funnel_df: pd.DataFrame, group_by: Iterable[str] = ('category',),
+                   workers: Optional[int] = None) -> 'PartitionedFunnel':
+        """
+        Funnel tablosunu tarih aralıklarına bölüp process havuzunda topla.
+        workers verilmezse CPU sayısı kullanılır; küçük tablolarda bölüm sayısı
+        MIN_ROWS_PER_SHARD ile sınırlanır.
+        """
+        group_by = list(group_by)
+        days = funnel_df['date'].to_numpy().astype('datetime64[D]').astype(np.int32)
+        first_day = int(days.min()) if len(days) else 0
+        n_days = int(days.max()) - first_day + 1 if len(days) else 0
+
+        labels = {}
+        codes_by_column = {}
+        for col in group_by:
+            codes_by_column[col], labels[col] = group_codes(funnel_df[col])
+
+        blocks: List[SharedMemory] = []
+        try:
+            specs = {
+                'day': _share(days, blocks),
+                'groups': {col: _share(codes.astype(np.int32), blocks) for col, codes in codes_by_column.items()},
+                'stages': {col: _share(funnel_df[col].to_numpy(), blocks) for col in STAGE_COLUMNS.values()}
+            }
+            cells = _run_shards(specs, cls._offsets(first_day, group_by),
+                                (n_days,) + tuple(len(labels[col]) + 1 for col in group_by),
+                                shard_bounds(days, cls._shard_count(len(funnel_df), workers)))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        key_dtypes = {col: funnel_df[col].dtype for col in group_by}
+        return cls._from_cells(cells, first_day, funnel_df['date'].dtype, labels, key_dtypes, len(funnel_df))
+
+    @classmethod
+    def from_column_store(cls, store: ColumnStore, group_by: Iterable[str] = ('category',),
+                          workers: Optional[int] = None) -> 'PartitionedFunnel':
+        """
+        Memory-mapped kolon deposundan topla. Ana process veriyi belleğe
+        almaz; her worker kolon dosyalarının kendi satır aralığını okur.
+        """
+        group_by = list(group_by)
+        for col in group_by:
+            if store.kind(col) != 'category':
+                raise ValueError(f"group_by kolonu category olmalı: {col}")
+
+        date_stats = store.stats('date')
+        first_day = date_stats['min'] if store.rows else 0
+        n_days = date_stats['max'] - first_day + 1 if store.rows else 0
+        labels = {col: pd.Index(store.categories(col)) for col in group_by}
+
+        specs = {
+            'day': _mapped(store, 'date'),
+            'groups': {col: _mapped(store, col) for col in group_by},
+            'stages': {col: _mapped(store, col) for col in STAGE_COLUMNS.values()}
+        }
+        cells = _run_shards(specs, cls._offsets(first_day, group_by),
+                            (n_days,) + tuple(len(labels[col]) + 1 for col in group_by),
+                            shard_bounds(store.column('date'), cls._shard_count(store.rows, workers)))
+
+        key_dtypes = {col: pd.CategoricalDtype(store.categories(col)) for col in group_by}
+        return cls._from_cells(cells, first_day, np.dtype('datetime64[s]'), labels, key_dtypes, store.rows)
+
+    @staticmethod
+    def _offsets(first_day: int, group_by: List[str]) -> Dict[str, int]:
+        return {'day': -first_day, **{col: 1 for col in group_by}}
+
+    @staticmethod
+    def _shard_count(rows: int, workers: Optional[int]) -> int:
+        workers = workers or os.cpu_count() or 1
+        return max(1, min(workers, rows // MIN_ROWS_PER_SHARD))
+
+    @classmethod
+    def _from_cells(cls, cells: np.ndarray, first_day: int, date_dtype, labels: Dict[str, pd.Index],
+                    key_dtypes: Dict, rows: int) -> 'PartitionedFunnel':
+        """Hücre tablosundan gün ve grup toplamlarını türet; kolon 0 satır sayısıdır (gözlenmeyenler elenir)"""
+        columns = list(STAGE_COLUMNS.values())
+        n_axes = cells.ndim - 1
+
+        daily = cells.sum(axis=tuple(range(1, n_axes)))
+        observed = daily[:, 0] > 0
+        daily_totals = pd.DataFrame(daily[observed, 1:], columns=columns)
+        daily_totals.insert(0, 'date', (np.flatnonzero(observed) + first_day).astype('datetime64[D]')
+                            .astype(date_dtype))
+
+        # Grup anahtarları kaynak kolonun tipini (category vb.) korur; eksik anahtar hücresi atlanır
+        group_totals = {}
+        for axis, col in enumerate(labels, start=1):
+            merged = cells.sum(axis=tuple(a for a in range(n_axes) if a != axis))[1:]
+            observed = merged[:, 0] > 0
+            keys = pd.Index(pd.array(labels[col][observed], dtype=key_dtypes[col]), name=col)
+            group_totals[col] = pd.DataFrame(merged[observed, 1:], columns=columns, index=keys)
+        return cls(daily_totals, group_totals, rows)
+
+    def funnel_analyzer(self) -> FunnelAnalyzer:
+        """Paralel toplamlar üzerinde akış modundaki FunnelAnalyzer"""
+        aggregator = StreamingFunnelAggregator(self.group_totals.keys())
+        aggregator.stage_totals = self.daily_totals[list(STAGE_COLUMNS.values())].to_numpy().sum(axis=0)
+        aggregator.group_partials = dict(self.group_totals)
+        aggregator.rows = self.rows
+        return FunnelAnalyzer(aggregator=aggregator)
+
+    def trend_analyzer(self) -> TrendAnalyzer:
+        """Paralel hesaplanmış günlük toplamlar üzerinde TrendAnalyzer"""
+        return TrendAnalyzer(daily_totals=self.daily_totals)
@@ -0,0 +1,84 @@
+"""
+E-Ticaret Satış Analizi - Pipeline Modülü
+
+Türetilmiş tablolar bir bağımlılık grafiği (DAG) olarak tanımlanır. Her adım
+tam olarak bir kez çalışır, sonucu kendisine bağımlı adımlara aktarılır ve
+birbirinden bağımsız dallar paralel çalıştırılabilir.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class Pipeline:
+    """Bağımlılık grafiği tabanlı adım çalıştırıcı"""
+
+    def __init__(self):
+        self.steps: Dict[str, Callable] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable, deps: Iterable[str] = ()) -> None:
+        """Adım ekle; func bağımlılıkların sonuçlarını sırayla argüman olarak alır"""
+        if name in self.steps:
+            raise ValueError(f"Adım zaten tanımlı: {name}")
+        self.steps[name] = func
+        self.dependencies[name] = list(deps)
+
+    def _required_steps(self, targets: Optional[Iterable[str]]) -> List[str]:
+        """Hedefler için gereken adımları topolojik sırada döndür"""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str) -> None:
+            if name not in self.steps:
+                raise KeyError(f"Tanımsız adım: {name}")
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Döngüsel bağımlılık: {name}")
+            state[name] = 'visiting'
+            for dep in self.dependencies[name]:
+                visit(dep)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in (targets if targets is not None else self.steps):
+            visit(name)
+        return order
+
+    def _run_step(self, name: str, results: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        value = self.steps[name](*[results[dep] for dep in self.dependencies[name]])
+        self.timings[name] = time.perf_counter() - start
+        return value
+
+    def run(self, targets: Optional[Iterable[str]] = None, max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Adımları çalıştır ve sonuçlarını döndür.
+
+        max_workers > 1 ise bağımlılıkları tamamlanmış adımlar thread havuzunda
+        eşzamanlı çalışır (pandas/NumPy işlemlerinin çoğu GIL'i bırakır).
+        """
+        order = self._required_steps(targets)
+        results: Dict[str, Any] = {}
+
+        if max_workers <= 1:
+            for name in order:
+                results[name] = self._run_step(name, results)
+            return results
+
+        pending = list(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    if all(dep in results for dep in self.dependencies[name]):
+                        pending.remove(name)
+                        running[executor.submit(self._run_step, name, results)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+        return results
@@ -0,0 +1,125 @@
+"""
+E-Ticaret Satış Analizi - Tembel Sorgu Modülü
+
+scan() ile alınan veri seti tanıtıcısı üzerinde filter/select/groupby
+işlemleri sadece bir plan oluşturur; veri .collect() çağrılana kadar
+okunmaz. Toplamadan önceki filtreler ve ihtiyaç duyulan kolonlar
+okuyucuya (Parquet row group'ları / CSV usecols) itilir.
+"""
+
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .data_loader import apply_filters, load_raw_data
+from .storage import FILTER_OPS, RAW_FILES
+
+class LazyFrame:
+    """Tek bir ham veri seti üzerinde değişmez (immutable) sorgu planı"""
+
+    def __init__(self, name: str, steps: Tuple = (), use_store: bool = True, compact: bool = False):
+        if name not in RAW_FILES:
+            raise KeyError(f"Bilinmeyen veri seti: {name}")
+        self.name = name
+        self.steps = steps
+        self.use_store = use_store
+        self.compact = compact
+
+    def _with(self, step: Tuple) -> 'LazyFrame':
+        return LazyFrame(self.name, self.steps + (step,), self.use_store, self.compact)
+
+    def filter(self, column: str, op: str, value) -> 'LazyFrame':
+        """Satır filtresi; örnek: .filter('category', 'in', ['Elektronik', 'Giyim'])"""
+        if op not in FILTER_OPS:
+            raise ValueError(f"Desteklenmeyen filtre operatörü: {op}")
+        return self._with(('filter', (column, op, value)))
+
+    def select(self, *columns: str) -> 'LazyFrame':
+        """Kolon seçimi"""
+        return self._with(('select', list(columns)))
+
+    def groupby(self, by) -> 'LazyGroupBy':
+        return LazyGroupBy(self, [by] if isinstance(by, str) else list(by))
+
+    def _split(self) -> Tuple[Tuple, Tuple]:
+        """Planı ilk toplamadan önceki (okuyucuya itilebilen) ve sonraki adımlara ayır"""
+        for i, (kind, *_) in enumerate(self.steps):
+            if kind == 'aggregate':
+                return self.steps[:i], self.steps[i:]
+        return self.steps, ()
+
+    def _scan_plan(self) -> Tuple[Optional[List[str]], List[Tuple], Tuple]:
+        """Okunacak kolonlar, itilen filtreler ve bellekte çalışacak adımlar"""
+        pushed, remaining = self._split()
+
+        visible: Optional[List[str]] = None
+        filters = []
+        for kind, arg in pushed:
+            if kind == 'filter':
+                if visible is not None and arg[0] not in visible:
+                    raise KeyError(f"Filtre kolonu seçimde yok: {arg[0]}")
+                filters.append(arg)
+            else:
+                missing = [col for col in arg if visible is not None and col not in visible]
+                if missing:
+                    raise KeyError(f"Kolonlar seçimde yok: {missing}")
+                visible = arg
+
+        # Projeksiyon: toplama varsa sadece anahtarlar ve kaynak kolonlar okunur
+        if remaining:
+            _, by, aggregations = remaining[0]
+            columns = list(dict.fromkeys(by + [column for column, _ in aggregations.values()]))
+            if visible is not None:
+                missing = [col for col in columns if col not in visible]
+                if missing:
+                    raise KeyError(f"Kolonlar seçimde yok: {missing}")
+        else:
+            columns = visible
+        return columns, filters, remaining
+
+    def explain(self) -> str:
+        """Çalıştırılacak planın okunabilir özeti"""
+        columns, filters, remaining = self._scan_plan()
+        lines = [f"SCAN {self.name} columns={columns or '*'} filters={filters or '-'}"]
+        for kind, *args in remaining:
+            lines.append(f"{kind.upper()} {' '.join(map(str, args))}")
+        return "\n".join(lines)
+
+    def collect(self) -> pd.DataFrame:
+        """Planı çalıştır"""
+        columns, filters, remaining = self._scan_plan()
+        df = load_raw_data([self.name], columns={self.name: columns} if columns else None,
+                           use_store=self.use_store, compact=self.compact,
+                           filters={self.name: filters})[self.name]
+
+        for kind, *args in remaining:
+            if kind == 'aggregate':
+                by, aggregations = args
+                df = df.groupby(by, observed=True).agg(**aggregations).reset_index()
+            elif kind == 'filter':
+                df = apply_filters(df, [args[0]])
+            else:
+                df = df[args[0]]
+        return df
+
+    def __repr__(self) -> str:
+        return f"<LazyFrame\n{self.explain()}\n>"
+
+class LazyGroupBy:
+    """groupby(...).agg(...) için ara nesne"""
+
+    def __init__(self, frame: LazyFrame, by: List[str]):
+        self.frame = frame
+        self.by = by
+
+    def agg(self, **aggregations: Tuple[str, str]) -> LazyFrame:
+        """
+        Adlandırılmış toplama; örnek: .agg(sessions=('session_id', 'count'),
+        purchases=('complete_purchase', 'sum'))
+        """
+        if not aggregations:
+            raise ValueError("En az bir toplama verilmeli")
+        return self.frame._with(('aggregate', self.by, aggregations))
+
+def scan(name: str, use_store: bool = True, compact: bool = False) -> LazyFrame:
+    """Ham veri seti için tembel tanıtıcı (funnel, behavior, rfm, sales)"""
+    return LazyFrame(name, use_store=use_store, compact=compact)
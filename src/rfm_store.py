@@ -0,0 +1,213 @@
+"""
+E-Ticaret Satış Analizi - RFM Durum Deposu Modülü
+
+Müşteri bazlı RFM durumu (son alışveriş tarihi, sipariş sayısı, toplam
+tutar) yeni siparişlerle yerinde güncellenir. Skor ve segment sadece
+dokunulan müşteriler için yeniden hesaplanır; tek müşterinin segmenti
+sözlük üzerinden O(1) okunur.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Optional
+
+from .analyzer import quartile_bins, quartile_edges
+from .sketch import RFM_COLUMNS
+
+# Segment adları ve kuralları veri üreticisiyle (create_rfm_data_vectorized) ortaktır
+RFM_SEGMENTS = ['Champions', 'Loyal Customers', 'At Risk', 'Lost']
+
+def classify_segments(recency_days, frequency, monetary) -> np.ndarray:
+    """Segment kuralları (create_rfm_data ile aynı öncelik sırası), RFM_SEGMENTS indeksi olarak int8 kod"""
+    recency_days = np.asarray(recency_days)
+    frequency = np.asarray(frequency)
+    monetary = np.asarray(monetary)
+    return np.select(
+        [
+            (recency_days <= 30) & (frequency >= 3) & (monetary >= 200),
+            (recency_days <= 60) & (frequency >= 2),
+            recency_days <= 90
+        ],
+        [0, 1, 2],
+        default=3
+    ).astype(np.int8)
+
+class RFMStateStore:
+    """customer_id anahtarlı, artımlı güncellenen RFM durumu"""
+
+    def __init__(self, edges: Optional[Dict[str, np.ndarray]] = None, capacity: int = 1024):
+        self.edges = edges
+        self.as_of: Optional[np.datetime64] = None
+        self.size = 0
+        self._index: Dict[Hashable, int] = {}
+        self._ids = np.empty(capacity, dtype=object)
+        self._last_purchase = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[D]')
+        self._frequency = np.zeros(capacity, dtype=np.int64)
+        self._monetary = np.zeros(capacity, dtype=np.float64)
+        self._segment = np.full(capacity, -1, dtype=np.int8)
+        self._rfm_code = np.zeros(capacity, dtype=np.int16)
+
+    @classmethod
+    def from_rfm_frame(cls, rfm_df: pd.DataFrame) -> 'RFMStateStore':
+        """rfm_data.csv biçimindeki tablodan depo oluştur; quartile sınırları bu tablodan alınır"""
+        last_purchase = pd.to_datetime(rfm_df['last_purchase_date']).to_numpy().astype('datetime64[D]')
+        store = cls(edges={col: quartile_edges(rfm_df[col]) for col in RFM_COLUMNS},
+                    capacity=max(1024, 2 * len(rfm_df)))
+        store.as_of = (last_purchase + rfm_df['recency_days'].to_numpy().astype('timedelta64[D]')).max()
+
+        slots, _ = store._slots_for(rfm_df['customer_id'].to_numpy())
+        store._last_purchase[slots] = last_purchase
+        store._frequency[slots] = rfm_df['frequency'].to_numpy()
+        store._monetary[slots] = rfm_df['monetary'].to_numpy()
+        store._rescore(slots)
+        return store
+
+    def _grow(self, required: int) -> None:
+        capacity = len(self._ids)
+        if required <= capacity:
+            return
+        new_capacity = max(required, 2 * capacity)
+        extra = new_capacity - capacity
+        self._ids = np.concatenate([self._ids, np.empty(extra, dtype=object)])
+        self._last_purchase = np.concatenate(
+            [self._last_purchase, np.full(extra, np.datetime64('NaT'), dtype='datetime64[D]')])
+        self._frequency = np.concatenate([self._frequency, np.zeros(extra, dtype=np.int64)])
+        self._monetary = np.concatenate([self._monetary, np.zeros(extra, dtype=np.float64)])
+        self._segment = np.concatenate([self._segment, np.full(extra, -1, dtype=np.int8)])
+        self._rfm_code = np.concatenate([self._rfm_code, np.zeros(extra, dtype=np.int16)])
+
+    def _slots_for(self, customer_ids) -> tuple:
+        """Müşteri kimliklerinin satır indeksleri; yeni müşteriler için satır açılır"""
+        slots = np.empty(len(customer_ids), dtype=np.int64)
+        is_new = np.zeros(len(customer_ids), dtype=bool)
+        unseen = []
+        for i, customer_id in enumerate(customer_ids):
+            slot = self._index.get(customer_id)
+            if slot is None:
+                unseen.append(i)
+            else:
+                slots[i] = slot
+
+        # Kapasite sadece gerçekten yeni (tekrarsız) müşteri sayısı kadar artar
+        self._grow(self.size + len({customer_ids[i] for i in unseen}))
+        for i in unseen:
+            customer_id = customer_ids[i]
+            slot = self._index.get(customer_id)
+            if slot is None:
+                slot = self.size
+                self._index[customer_id] = slot
+                self._ids[slot] = customer_id
+                self.size += 1
+                is_new[i] = True
+            slots[i] = slot
+        return slots, is_new
+
+    def _recency(self, slots: np.ndarray) -> np.ndarray:
+        return (self.as_of - self._last_purchase[slots]).astype(np.int64)
+
+    def _rescore(self, slots: np.ndarray) -> None:
+        """Sadece verilen satırların segment ve RFM kodunu yeniden hesapla"""
+        recency = self._recency(slots)
+        frequency = self._frequency[slots]
+        monetary = self._monetary[slots]
+        self._segment[slots] = classify_segments(recency, frequency, monetary)
+
+        if self.edges is not None:
+            r_bins = quartile_bins(recency, self.edges['recency_days'])
+            f_bins = quartile_bins(frequency, self.edges['frequency'])
+            m_bins = quartile_bins(monetary, self.edges['monetary'])
+            self._rfm_code[slots] = (4 - r_bins) * 100 + (f_bins + 1) * 10 + (m_bins + 1)
+
+    def ingest(self, orders: pd.DataFrame, customer_col: str = 'customer_id',
+               date_col: str = 'order_date', amount_col: str = 'total_amount',
+               as_of=None) -> pd.DataFrame:
+        """
+        Yeni siparişleri (ecommerce_sales.csv biçiminde) işle.
+
+        as_of verilmezse referans tarih, mevcut tarih ile en yeni sipariş
+        tarihinin büyüğüdür. Dokunulmayan müşterilerin skorları son
+        güncellendikleri referans tarihe göredir; tümünü güncellemek için
+        rescore_all kullanılır. Segmenti değişen müşterileri döndürür.
+        """
+        orders = orders[[customer_col, date_col, amount_col]].copy()
+        orders[date_col] = pd.to_datetime(orders[date_col])
+        batch = orders.groupby(customer_col).agg(
+            last_purchase=(date_col, 'max'),
+            order_count=(date_col, 'size'),
+            amount=(amount_col, 'sum')
+        )
+
+        slots, is_new = self._slots_for(batch.index.to_numpy())
+        old_segments = self._segment[slots].copy()
+
+        batch_last = batch['last_purchase'].to_numpy().astype('datetime64[D]')
+        current_last = self._last_purchase[slots]
+        self._last_purchase[slots] = np.where(is_new | (batch_last > current_last), batch_last, current_last)
+        self._frequency[slots] += batch['order_count'].to_numpy()
+        self._monetary[slots] += batch['amount'].to_numpy()
+
+        latest = batch_last.max()
+        if as_of is not None:
+            self.as_of = np.datetime64(pd.Timestamp(as_of).date())
+        elif self.as_of is None or latest > self.as_of:
+            self.as_of = latest
+
+        self._rescore(slots)
+
+        new_segments = self._segment[slots]
+        changed = old_segments != new_segments
+        labels = np.array(RFM_SEGMENTS + [None], dtype=object)
+        return pd.DataFrame({
+            'customer_id': batch.index.to_numpy()[changed],
+            'old_segment': labels[old_segments[changed]],
+            'new_segment': labels[new_segments[changed]]
+        })
+
+    def rescore_all(self, as_of=None, refresh_edges: bool = True) -> None:
+        """Tüm müşterileri (isteğe bağlı yeni quartile sınırlarıyla) yeniden skorla"""
+        if as_of is not None:
+            self.as_of = np.datetime64(pd.Timestamp(as_of).date())
+        slots = np.arange(self.size)
+        if refresh_edges:
+            self.edges = {
+                'recency_days': quartile_edges(self._recency(slots)),
+                'frequency': quartile_edges(self._frequency[:self.size]),
+                'monetary': quartile_edges(self._monetary[:self.size])
+            }
+        self._rescore(slots)
+
+    def get_segment(self, customer_id: Hashable) -> str:
+        """Müşterinin güncel segmenti (O(1))"""
+        return RFM_SEGMENTS[self._segment[self._index[customer_id]]]
+
+    def get_customer(self, customer_id: Hashable) -> Dict:
+        """Müşterinin güncel RFM durumu (O(1))"""
+        slot = self._index[customer_id]
+        return {
+            'customer_id': customer_id,
+            'recency_days': int((self.as_of - self._last_purchase[slot]).astype(np.int64)),
+            'frequency': int(self._frequency[slot]),
+            'monetary': float(self._monetary[slot]),
+            'segment': RFM_SEGMENTS[self._segment[slot]],
+            'RFM_code': int(self._rfm_code[slot]),
+            'last_purchase_date': pd.Timestamp(self._last_purchase[slot])
+        }
+
+    def __contains__(self, customer_id: Hashable) -> bool:
+        return customer_id in self._index
+
+    def __len__(self) -> int:
+        return self.size
+
+    def to_frame(self) -> pd.DataFrame:
+        """rfm_data.csv biçiminde tablo (RFMAnalyzer ile kullanılabilir)"""
+        slots = np.arange(self.size)
+        return pd.DataFrame({
+            'customer_id': self._ids[:self.size],
+            'recency_days': self._recency(slots),
+            'frequency': self._frequency[:self.size],
+            'monetary': self._monetary[:self.size],
+            'segment': pd.Categorical.from_codes(self._segment[:self.size], categories=RFM_SEGMENTS),
+            'last_purchase_date': self._last_purchase[:self.size],
+            'RFM_code': self._rfm_code[:self.size]
+        })
@@ -0,0 +1,209 @@
+"""
+E-Ticaret Satış Analizi - Kolon Bazlı Depolama Modülü
+
+Ham CSV dosyaları bir kez Parquet formatına dönüştürülür, sonraki
+yüklemeler kolon seçimi (projection) ve row-group filtrelemesi
+(predicate pushdown) ile sadece gereken baytları okur.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+RAW_PATH = Path("data/raw")
+STORE_PATH = Path("data/columnar")
+
+# Veri seti adı -> ham CSV dosyası
+RAW_FILES = {
+    'funnel': "funnel_data.csv",
+    'behavior': "user_behavior.csv",
+    'rfm': "rfm_data.csv",
+    'sales': "ecommerce_sales.csv"
+}
+
+# Tarih olarak parse edilen kolonlar (load_raw_data ile aynı)
+DATE_COLUMNS = {
+    'funnel': ['date'],
+    'behavior': ['date']
+}
+
+# Sözlük (dictionary) kodlamasıyla saklanan düşük kardinaliteli kolonlar
+CATEGORICAL_COLUMNS = ['category', 'device_type', 'source']
+
+# Pushdown destekli filtre operatörleri (pyarrow filters ile aynı)
+FILTER_OPS = ['==', '!=', '<', '<=', '>', '>=', 'in', 'not in']
+
+ROW_GROUP_SIZE = 64_000
+CSV_CHUNK_ROWS = 1_000_000
+
+def store_file(name: str, store_path: Path = STORE_PATH) -> Path:
+    """Veri setinin Parquet dosya yolu"""
+    return Path(store_path) / f"{name}.parquet"
+
+def is_store_fresh(name: str, raw_path: Path = RAW_PATH, store_path: Path = STORE_PATH) -> bool:
+    """Parquet dosyası var ve ham CSV'den daha yeni mi?"""
+    parquet_file = store_file(name, store_path)
+    csv_file = Path(raw_path) / RAW_FILES[name]
+    if not parquet_file.exists():
+        return False
+    if not csv_file.exists():
+        return True
+    return parquet_file.stat().st_mtime >= csv_file.stat().st_mtime
+
+def dataset_source(name: str, use_store: bool = True, raw_path: Path = RAW_PATH,
+                   store_path: Path = STORE_PATH) -> Path:
+    """load_raw_data'nın veri setini okuyacağı dosya (güncel Parquet deposu veya ham CSV)"""
+    if use_store and is_store_fresh(name, raw_path, store_path):
+        return store_file(name, store_path)
+    return Path(raw_path) / RAW_FILES[name]
+
+def _to_arrow(name: str, chunk: pd.DataFrame) -> pa.Table:
+    """CSV parçasını sözlük kodlamalı Arrow tablosuna çevir"""
+    for col in DATE_COLUMNS.get(name, []):
+        if col in chunk.columns:
+            chunk[col] = pd.to_datetime(chunk[col])
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+
+    # Parçalar arasında şema tutarlı kalsın diye sözlük tipi sabitlenir
+    fields = []
+    for field in table.schema:
+        if field.name in CATEGORICAL_COLUMNS:
+            field = pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+        fields.append(field)
+    return table.cast(pa.schema(fields))
+
+def _to_pandas(table: pa.Table, dictionary_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Arrow tablosunu CSV yolunun vereceği DataFrame'e çevir: sözlük kodlamalı
+    kolonlar sadece dictionary_columns içindeyse category olur, kategoriler
+    (CSV'deki astype('category') gibi) sıralı ve sadece görülen değerlerdir.
+    """
+    dictionary_columns = set(dictionary_columns or [])
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type) and field.name not in dictionary_columns:
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+
+    df = table.to_pandas()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col].cat.remove_unused_categories()
+            df[col] = values.cat.reorder_categories(values.cat.categories.sort_values())
+    return df
+
+def normalize_filters(name: str, filters: Optional[List[Tuple]]) -> List[Tuple]:
+    """(kolon, operatör, değer) filtrelerini doğrula; tarih kolonlarındaki değerleri Timestamp'e çevir"""
+    normalized = []
+    for column, op, value in filters or []:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Desteklenmeyen filtre operatörü: {op}")
+        if column in DATE_COLUMNS.get(name, []):
+            if op in ('in', 'not in'):
+                value = [pd.Timestamp(v) for v in value]
+            else:
+                value = pd.Timestamp(value)
+        elif op in ('in', 'not in'):
+            value = list(value)
+        normalized.append((column, op, value))
+    return normalized
+
+def date_range_filters(name: str, date_range: Optional[Tuple]) -> List[Tuple]:
+    """(başlangıç, bitiş) kapalı aralığını `date` filtrelerine çevir; uçlardan biri None olabilir"""
+    if date_range is None or 'date' not in DATE_COLUMNS.get(name, []):
+        return []
+    start, end = date_range
+    filters = []
+    if start is not None:
+        filters.append(('date', '>=', pd.Timestamp(start)))
+    if end is not None:
+        filters.append(('date', '<=', pd.Timestamp(end)))
+    return filters
+
+def _csv_header(csv_file: Path) -> pd.DataFrame:
+    """CSV başlığındaki kolonlarla boş DataFrame (dosya tamamen boşsa kolonsuz)"""
+    try:
+        return pd.read_csv(csv_file, nrows=0)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+def convert_raw_to_columnar(raw_path: Path = RAW_PATH, store_path: Path = STORE_PATH,
+                            names: Optional[List[str]] = None, force: bool = False) -> Dict[str, Path]:
+    """
+    Ham CSV'leri Parquet'e dönüştür.
+
+    Büyük dosyalar CSV_CHUNK_ROWS satırlık parçalar halinde okunur, böylece
+    dönüşüm sırasında bellek kullanımı sınırlı kalır. Güncel olan dosyalar
+    force=True verilmedikçe atlanır. Veri satırı olmayan CSV için başlıktaki
+    kolonlarla boş bir tablo yazılır.
+    """
+    store_path = Path(store_path)
+    store_path.mkdir(parents=True, exist_ok=True)
+
+    written = {}
+    for name in names or RAW_FILES:
+        if not force and is_store_fresh(name, raw_path, store_path):
+            continue
+
+        target = store_file(name, store_path)
+        tmp_target = target.with_suffix(".parquet.tmp")
+        csv_file = Path(raw_path) / RAW_FILES[name]
+        writer = None
+        try:
+            try:
+                chunks = pd.read_csv(csv_file, chunksize=CSV_CHUNK_ROWS)
+            except pd.errors.EmptyDataError:
+                chunks = []
+            for chunk in chunks:
+                table = _to_arrow(name, chunk)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_target, table.schema)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+            if writer is None:
+                pq.write_table(_to_arrow(name, _csv_header(csv_file)), tmp_target)
+        finally:
+            if writer is not None:
+                writer.close()
+        tmp_target.replace(target)
+        written[name] = target
+
+    return written
+
+def read_dataset(name: str, columns: Optional[List[str]] = None,
+                 date_range: Optional[Tuple] = None, store_path: Path = STORE_PATH,
+                 dictionary_columns: Optional[List[str]] = None,
+                 filters: Optional[List[Tuple]] = None) -> pd.DataFrame:
+    """
+    Parquet'ten veri seti oku.
+
+    columns: sadece bu kolonlar okunur.
+    date_range: (başlangıç, bitiş) kapalı aralığı; `date` kolonu olan veri
+    setlerinde row-group istatistikleriyle filtrelenir. Uçlardan biri None
+    olabilir.
+    dictionary_columns: metin kolonlarını string yerine sözlük (category)
+    olarak oku.
+    filters: (kolon, operatör, değer) listesi (VE ile bağlanır); row-group
+    istatistikleriyle elenir, kalan satırlar okuma sırasında süzülür.
+    Filtre kolonlarının columns içinde olması gerekmez.
+    """
+    filters = date_range_filters(name, date_range) + normalize_filters(name, filters)
+    table = pq.read_table(store_file(name, store_path), columns=columns, filters=filters or None,
+                          read_dictionary=dictionary_columns)
+    return _to_pandas(table, dictionary_columns)
+
+def iter_dataset_batches(name: str, columns: Optional[List[str]] = None,
+                         batch_size: int = ROW_GROUP_SIZE, store_path: Path = STORE_PATH,
+                         dictionary_columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Parquet veri setini sabit boyutlu DataFrame parçaları halinde oku"""
+    parquet_file = pq.ParquetFile(store_file(name, store_path), read_dictionary=dictionary_columns)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield _to_pandas(pa.Table.from_batches([batch]), dictionary_columns)
+
+if __name__ == "__main__":
+    converted = convert_raw_to_columnar()
+    for name, path in converted.items():
+        print(f"✅ {name} -> {path}")
+    if not converted:
+        print("✅ Kolon bazlı depo güncel")
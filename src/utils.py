@@ -5,69 +5,80 @@ Utility functions for e-commerce sales analysis project.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-def create_sample_data():
+# Sample data label tables; category price ranges are looked up by category code
+SAMPLE_CATEGORIES = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Spor', 'Kitap', 'Kozmetik']
+SAMPLE_PRICE_LOW = np.array([100, 50, 30, 100, 20, 30], dtype=np.float64)
+SAMPLE_PRICE_HIGH = np.array([5000, 500, 300, 1000, 200, 400], dtype=np.float64)
+SAMPLE_GENDERS = ['Erkek', 'Kadın']
+SAMPLE_PAYMENT_METHODS = ['Kredi Kartı', 'Banka Kartı', 'Havale']
+SAMPLE_REGIONS = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya']
+SAMPLE_PRODUCT_NUMBERS = 99  # product suffix 1..99
+
+def _sample_labels(codes, labels, compact):
+    """Map integer codes to labels: a Categorical if compact, plain strings otherwise"""
+    if compact:
+        return pd.Categorical.from_codes(codes, categories=labels)
+    return labels.take(codes)
+
+def iter_sample_data(n_rows=1000, chunk_rows=1_000_000, seed=42, compact=False):
     """
-    Create sample e-commerce sales data for analysis.
+    Generate sample e-commerce sales data as DataFrame chunks of at most
+    chunk_rows rows. Every column is drawn as a NumPy array; memory use
+    depends on chunk_rows, not on n_rows. n_rows=0 yields a single empty
+    chunk, so the schema (columns and dtypes) is always available.
+
+    Text columns are plain strings; compact=True returns them as
+    categoricals instead, which is much smaller for large n_rows.
     """
-    np.random.seed(42)
-    
+    rng = np.random.default_rng(seed)
+
     # Generate dates for the last year
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
-    dates = pd.date_range(start=start_date, end=end_date, freq='D')
-    
-    # Categories
-    categories = ['Elektronik', 'Giyim', 'Ev & Yaşam', 'Spor', 'Kitap', 'Kozmetik']
-    
-    # Generate data
-    data = []
-    for _ in range(1000):
-        date = np.random.choice(dates)
-        category = np.random.choice(categories)
-        age = np.random.randint(18, 70)
-        gender = np.random.choice(['Erkek', 'Kadın'])
-        
-        # Generate realistic prices based on category
-        if category == 'Elektronik':
-            price = np.random.uniform(100, 5000)
-        elif category == 'Giyim':
-            price = np.random.uniform(50, 500)
-        elif category == 'Ev & Yaşam':
-            price = np.random.uniform(30, 300)
-        elif category == 'Spor':
-            price = np.random.uniform(100, 1000)
-        elif category == 'Kitap':
-            price = np.random.uniform(20, 200)
-        else:  # Kozmetik
-            price = np.random.uniform(30, 400)
-        
-        # Add some randomness
-        price = price * np.random.uniform(0.8, 1.2)
-        
-        # Generate quantity (1-5 items)
-        quantity = np.random.randint(1, 6)
-        total_amount = price * quantity
-        
-        data.append({
-            'date': date,
-            'category': category,
-            'product_name': f'{category} Ürünü {np.random.randint(1, 100)}',
-            'price': round(price, 2),
+    dates = pd.date_range(start=start_date, end=end_date, freq='D').to_numpy()
+
+    # Label tables; rows only carry integer codes
+    category_labels = pd.Index(SAMPLE_CATEGORIES)
+    product_labels = pd.Index([f'{category} Ürünü {number}' for category in SAMPLE_CATEGORIES
+                               for number in range(1, SAMPLE_PRODUCT_NUMBERS + 1)])
+    gender_labels = pd.Index(SAMPLE_GENDERS)
+    payment_labels = pd.Index(SAMPLE_PAYMENT_METHODS)
+    region_labels = pd.Index(SAMPLE_REGIONS)
+
+    for start in range(0, max(n_rows, 1), chunk_rows):
+        n = min(chunk_rows, n_rows - start)
+        category = rng.integers(0, len(category_labels), n)
+
+        # Category-based price range, plus some randomness
+        price = rng.uniform(SAMPLE_PRICE_LOW[category], SAMPLE_PRICE_HIGH[category]) * rng.uniform(0.8, 1.2, n)
+
+        # Quantity (1-5 items)
+        quantity = rng.integers(1, 6, n)
+        product = category * SAMPLE_PRODUCT_NUMBERS + rng.integers(0, SAMPLE_PRODUCT_NUMBERS, n)
+
+        yield pd.DataFrame({
+            'date': dates[rng.integers(0, len(dates), n)],
+            'category': _sample_labels(category, category_labels, compact),
+            'product_name': _sample_labels(product, product_labels, compact),
+            'price': np.round(price, 2),
             'quantity': quantity,
-            'total_amount': round(total_amount, 2),
-            'customer_age': age,
-            'customer_gender': gender,
-            'payment_method': np.random.choice(['Kredi Kartı', 'Banka Kartı', 'Havale']),
-            'region': np.random.choice(['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya'])
-        })
-    
-    return pd.DataFrame(data)
+            'total_amount': np.round(price * quantity, 2),
+            'customer_age': rng.integers(18, 70, n),
+            'customer_gender': _sample_labels(rng.integers(0, len(gender_labels), n), gender_labels, compact),
+            'payment_method': _sample_labels(rng.integers(0, len(payment_labels), n), payment_labels, compact),
+            'region': _sample_labels(rng.integers(0, len(region_labels), n), region_labels, compact)
+        }, index=pd.RangeIndex(start, start + n))
+
+def create_sample_data(n_rows=1000, chunk_rows=1_000_000, seed=42, compact=False):
+    """
+    Create sample e-commerce sales data for analysis.
+    compact=True returns the text columns as categoricals.
+    """
+    return pd.concat(list(iter_sample_data(n_rows, chunk_rows, seed, compact)))
 
 def get_project_info():
     """
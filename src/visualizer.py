@@ -1,20 +1,111 @@
 """
 E-Ticaret Satış Analizi - Görselleştirme Modülü
+
+Plotly modül yüklenirken değil, bir görselleştirme fonksiyonu ilk
+çağrıldığında import edilir; analiz ve veri yükleme işleri bu maliyeti ödemez.
 """
 
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from .downsample import bin_scatter, lttb
+from .figure_cache import cached_figure
+
+# Grafiğe gönderilen nokta sayısı sınırları (üzerindeki veri sunucu tarafında örneklenir)
+LINE_MAX_POINTS = 2000
+SCATTER_MAX_POINTS = 20000
+SCATTER_BINS = (120, 80)
+
+# Bu nokta sayısından büyük scatter trace'leri WebGL (Scattergl) ile çizilir
+WEBGL_MIN_POINTS = 5000
+
+# İkili (base64 typed array) kodlanan trace alanları
+ARRAY_FIELDS = [('x',), ('y',), ('customdata',), ('marker', 'size'), ('marker', 'color')]
+
+def _typed_array(values):
+    """
+    Diziyi JSON'da base64 typed array olarak kodlanacak NumPy dizisine çevir.
+    Tarihler epoch milisaniyesine çevrilir (date eksenleri bunu doğrudan okur);
+    sayısal olmayan diziler için None döner.
+    """
+    if values is None or isinstance(values, (str, dict)) or np.ndim(values) != 1:
+        return None
+    array = np.asarray(values)
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    if array.dtype == object:
+        try:
+            array = array.astype(np.float64)
+        except (TypeError, ValueError):
+            return None
+    if array.dtype.kind not in 'iuf':
+        return None
+    if array.dtype.kind in 'iu' and len(array) and array.min() >= np.iinfo(np.int32).min \
+            and array.max() <= np.iinfo(np.int32).max:
+        array = array.astype(np.int32)
+    return array
+
+def optimize_figure(fig: 'go.Figure', webgl_min_points: int = WEBGL_MIN_POINTS) -> 'go.Figure':
+    """
+    Figürü büyük veri için hazırla: webgl_min_points'ten fazla noktalı
+    scatter trace'leri Scattergl'e çevrilir, sayısal ve tarih dizileri
+    metin yerine base64 typed array olarak kodlanacak dizilere dönüştürülür.
+    Aynı layout ile yeni bir figür döndürülür.
+    """
+    import plotly.graph_objects as go
+    traces = []
+    for trace in fig.data:
+        if trace.type == 'scatter' and trace.x is not None and len(trace.x) >= webgl_min_points:
+            # Scattergl'in kabul etmediği özellikler (cliponaxis, line.shape='spline' vb.) atlanır
+            props = trace.to_plotly_json()
+            props.pop('type')
+            trace = go.Scattergl(props, skip_invalid=True)
+        traces.append(trace)
+    fig = go.Figure(data=traces, layout=fig.layout)
+
+    for trace in fig.data:
+        for path in ARRAY_FIELDS:
+            owner = trace
+            for part in path[:-1]:
+                owner = owner[part] if part in owner else None
+            if owner is None or path[-1] not in owner:
+                continue
+            values = owner[path[-1]]
+            array = _typed_array(values)
+            if array is None:
+                continue
+            if path == ('x',) and np.issubdtype(np.asarray(values).dtype, np.datetime64):
+                fig.layout[f"xaxis{(trace.xaxis or 'x')[1:]}"].type = 'date'
+            owner[path[-1]] = array
+    return fig
+
+def export_static(fig: 'go.Figure', path, width: int = 1200, height: int = 700, scale: float = 1.0) -> Path:
+    """
+    Etkileşim gerektirmeyen raporlar için figürü statik görüntü olarak yaz
+    (biçim dosya uzantısından: png, svg, pdf, jpeg, webp). Opsiyonel kaleido
+    paketini gerektirir.
+    """
+    import importlib.util
+    if importlib.util.find_spec('kaleido') is None:
+        raise ImportError("Statik figür dışa aktarımı için kaleido gerekli: pip install 'kaleido>=1.0.0' "
+                          "(veya figürü HTML olarak yazın)")
+    path = Path(path)
+    fig.write_image(path, width=width, height=height, scale=scale)
+    return path
 
 class FunnelVisualizer:
     """Funnel görselleştirme sınıfı"""
     
     @staticmethod
+    @cached_figure
     def create_funnel_chart(funnel_stages: dict):
         """Funnel chart oluştur"""
+        import plotly.graph_objects as go
         fig = go.Figure(go.Funnel(
             y=list(funnel_stages.keys()),
             x=list(funnel_stages.values()),
@@ -34,8 +125,10 @@ class FunnelVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_conversion_chart(conversion_rates: dict):
         """Conversion rate chart oluştur"""
+        import plotly.express as px
         fig = px.bar(
             x=list(conversion_rates.keys()),
             y=list(conversion_rates.values()),
@@ -51,8 +144,10 @@ class RFMVisualizer:
     """RFM görselleştirme sınıfı"""
     
     @staticmethod
+    @cached_figure
     def create_segment_pie(rfm_df: pd.DataFrame):
         """Segment dağılımı pie chart"""
+        import plotly.express as px
         segment_counts = rfm_df['segment'].value_counts()
         
         fig = px.pie(
@@ -65,30 +160,54 @@ class RFMVisualizer:
         return fig
     
     @staticmethod
-    def create_rfm_scatter(rfm_df: pd.DataFrame):
-        """RFM scatter plot"""
+    @cached_figure
+    def create_rfm_scatter(rfm_df: pd.DataFrame, max_points: int = SCATTER_MAX_POINTS,
+                           bins=SCATTER_BINS):
+        """
+        RFM scatter plot. Müşteri sayısı max_points'i aşarsa noktalar segment
+        bazında bins ızgarasına toplanır; her hücre müşteri sayısıyla
+        ölçeklenen tek bir nokta olur.
+        """
+        import plotly.express as px
+        labels = {
+            'recency_days': 'Recency (Gün)',
+            'monetary': 'Monetary (TL)',
+            'frequency': 'Frequency'
+        }
+        if len(rfm_df) <= max_points:
+            return px.scatter(
+                rfm_df, 
+                x='recency_days', 
+                y='monetary',
+                color='segment', 
+                size='frequency',
+                title="RFM Analizi - Müşteri Segmentasyonu",
+                labels=labels
+            )
+
+        binned = bin_scatter(rfm_df, 'recency_days', 'monetary', group='segment', size='frequency', bins=bins)
         fig = px.scatter(
-            rfm_df, 
-            x='recency_days', 
+            binned,
+            x='recency_days',
             y='monetary',
-            color='segment', 
-            size='frequency',
-            title="RFM Analizi - Müşteri Segmentasyonu",
-            labels={
-                'recency_days': 'Recency (Gün)',
-                'monetary': 'Monetary (TL)',
-                'frequency': 'Frequency'
-            }
+            color='segment',
+            size='count',
+            hover_data=['count', 'frequency'],
+            title=f"RFM Analizi - Müşteri Segmentasyonu ({len(rfm_df):,} müşteri, {len(binned):,} hücre)",
+            labels={**labels, 'count': 'Müşteri Sayısı', 'frequency': 'Ort. Frequency'}
         )
-        
         return fig
 
 class TrendVisualizer:
     """Trend görselleştirme sınıfı"""
     
     @staticmethod
-    def create_trend_line(daily_trend: pd.DataFrame):
-        """Trend line chart"""
+    @cached_figure
+    def create_trend_line(daily_trend: pd.DataFrame, max_points: int = LINE_MAX_POINTS):
+        """Trend line chart (max_points'ten uzun seriler LTTB ile seyreltilir)"""
+        import plotly.express as px
+        if len(daily_trend) > max_points:
+            daily_trend = lttb(daily_trend, 'date', 'conversion_rate', max_points)
         fig = px.line(
             daily_trend, 
             x='date', 
@@ -103,8 +222,10 @@ class TrendVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_monthly_bar(monthly_trend: pd.DataFrame):
         """Aylık bar chart"""
+        import plotly.express as px
         fig = px.bar(
             monthly_trend, 
             x='month', 
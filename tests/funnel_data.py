@@ -0,0 +1,29 @@
+"""Testler için küçük, tekrarlanabilir funnel tabloları"""
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import STAGE_COLUMNS
+from src.data_loader import COMPACT_DTYPES
+
+def make_funnel(n_rows=5000, seed=0, start='2024-01-01', days=30):
+    """Aşamaları birbirini izleyen (page_view >= add_to_cart >= ...) rastgele funnel tablosu"""
+    rng = np.random.default_rng(seed)
+    depth = rng.integers(0, 5, n_rows)
+    df = pd.DataFrame({
+        'date': pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, n_rows), unit='D'),
+        'session_id': np.arange(1, n_rows + 1),
+        'category': rng.choice(['Elektronik', 'Giyim', 'Spor'], n_rows),
+        'device_type': rng.choice(['Desktop', 'Mobile', 'Tablet'], n_rows),
+        'source': rng.choice(['Google', 'Direct', 'Email'], n_rows)
+    })
+    for i, col in enumerate(STAGE_COLUMNS.values()):
+        df[col] = (depth > i).astype(np.int64)
+    return df
+
+def compact(df):
+    """data_loader'ın kompakt şeması (uint8 bayraklar, category metinler)"""
+    return df.astype({col: dtype for col, dtype in COMPACT_DTYPES['funnel'].items() if col in df.columns})
+
+def chunked(df, chunk_rows):
+    return [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)]
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analyzer import FunnelAnalyzer, RFMAnalyzer, TrendAnalyzer
+from funnel_data import chunked, compact, make_funnel
+
+def test_streaming_compact_chunks_match_in_memory_group_funnel():
+    funnel_df = make_funnel()
+    chunks = [compact(chunk) for chunk in chunked(funnel_df, 700)]
+
+    streaming = FunnelAnalyzer.from_chunks(chunks, group_by=['category'])
+    in_memory = FunnelAnalyzer(funnel_df)
+
+    expected = in_memory.calculate_group_funnel('category')
+    result = streaming.calculate_group_funnel('category')
+    result['category'] = result['category'].astype(str)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert streaming.calculate_funnel_stages() == in_memory.calculate_funnel_stages()
+
+def test_trend_update_with_compact_frames_matches_full_recompute():
+    funnel_df = make_funnel(days=10)
+    first, second = funnel_df.iloc[:2500], funnel_df.iloc[2500:]
+
+    trend = TrendAnalyzer(compact(first), windows={})
+    trend.calculate_daily_trends()
+    trend.update(compact(second))
+
+    expected = TrendAnalyzer(funnel_df, windows={}).calculate_daily_trends()
+    pd.testing.assert_frame_equal(trend.calculate_daily_trends(), expected)
+
+def test_rfm_scores_match_qcut():
+    rng = np.random.default_rng(5)
+    n = 2000
+    rfm_df = pd.DataFrame({
+        'customer_id': [f"customer_{i}" for i in range(n)],
+        'recency_days': rng.exponential(30, n).astype(np.int64),
+        'frequency': rng.poisson(3, n) + 1,
+        'monetary': rng.exponential(200, n)
+    })
+
+    scored = RFMAnalyzer(rfm_df).calculate_rfm_scores()
+
+    expected = {
+        'R_score': pd.qcut(rfm_df['recency_days'], q=4, labels=[4, 3, 2, 1]),
+        'F_score': pd.qcut(rfm_df['frequency'], q=4, labels=[1, 2, 3, 4]),
+        'M_score': pd.qcut(rfm_df['monetary'], q=4, labels=[1, 2, 3, 4])
+    }
+    for score, values in expected.items():
+        assert scored[score].astype(int).tolist() == values.astype(int).tolist()
+    rfm_score = (expected['R_score'].astype(str) + expected['F_score'].astype(str)
+                 + expected['M_score'].astype(str))
+    assert scored['RFM_score'].astype(str).tolist() == rfm_score.tolist()
+    assert list(scored.columns) == list(rfm_df.columns) + ['R_score', 'F_score', 'M_score', 'RFM_score']
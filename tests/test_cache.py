@@ -0,0 +1,64 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.cache import ResultCache, source_version
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return path
+
+def test_key_follows_content_not_mtime(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    source = write(tmp_path / 'raw.csv', "a,b\n1,2\n")
+    key = cache.key('step', [source], 'v1')
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.key('step', [source], 'v1') == key
+
+    write(source, "a,b\n1,3\n")
+    assert cache.key('step', [source], 'v1') != key
+    assert cache.key('step', [source], 'v2') != cache.key('step', [source], 'v1')
+
+def test_missing_input_changes_key(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    source = tmp_path / 'raw.csv'
+    missing = cache.key('step', [source], 'v1')
+    write(source, "a\n1\n")
+    assert cache.key('step', [source], 'v1') != missing
+
+def test_restore_rewrites_changed_outputs(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    output = write(tmp_path / 'out' / 'table.csv', "x\n1\n")
+    cache.store('key', 'step', [output])
+    cache.save()
+
+    write(output, "x\n2\n")
+    reopened = ResultCache(tmp_path / 'cache')
+    assert reopened.restore('key')
+    assert output.read_text(encoding='utf-8') == "x\n1\n"
+    assert not reopened.restore('other')
+
+def test_evict_drops_stale_entries_first(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    output = tmp_path / 'table.csv'
+    for i, key in enumerate(['old', 'new', 'other']):
+        write(output, f"x\n{i}\n" * 100)
+        cache.store(key, 'other' if key == 'other' else 'step', [output])
+        cache.entries[key]['last_used'] = i
+
+    budget = cache.total_bytes() - 1
+    assert cache.evict(budget) == ['old']
+    assert set(cache.entries) == {'new', 'other'}
+    assert len(list(cache.objects_path.iterdir())) == 2
+
+def test_source_version_covers_extra_files(tmp_path):
+    script = write(tmp_path / 'script.py', "print(1)\n")
+    version = source_version([script])
+    assert source_version([script]) == version
+    write(script, "print(2)\n")
+    assert source_version([script]) != version
@@ -0,0 +1,70 @@
+import mmap
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import parallel
+from src.analyzer import STAGE_COLUMNS, FunnelAnalyzer
+from src.column_store import ColumnStore, write_column_store
+from src.parallel import PartitionedFunnel
+from funnel_data import chunked, compact, make_funnel
+
+MEASURES = list(STAGE_COLUMNS.values())
+
+def test_round_trip_matches_source_frame(tmp_path):
+    funnel_df = make_funnel(3000)
+    # Parçalar farklı kategori alt kümeleri görür; ortak listeye eşlenmeleri gerekir
+    funnel_df = funnel_df.sort_values('category', kind='stable').reset_index(drop=True)
+
+    store = write_column_store((compact(chunk) for chunk in chunked(funnel_df, 700)), tmp_path / 'funnel')
+    frame = store.to_frame()
+
+    assert store.rows == len(funnel_df)
+    for col in ['category', 'device_type', 'source']:
+        assert frame[col].astype(str).tolist() == funnel_df[col].tolist()
+    np.testing.assert_array_equal(frame['date'].to_numpy().astype('datetime64[D]'),
+                                  funnel_df['date'].to_numpy().astype('datetime64[D]'))
+    np.testing.assert_array_equal(frame[MEASURES].to_numpy(), funnel_df[MEASURES].to_numpy())
+    assert FunnelAnalyzer(frame).calculate_funnel_stages() == FunnelAnalyzer(funnel_df).calculate_funnel_stages()
+
+def is_file_mapped(array):
+    """Dizi (veya base zincirindeki bir dizi) doğrudan dosya eşlemesine mi bağlı?"""
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+def test_to_frame_maps_files_without_copying(tmp_path):
+    store = write_column_store([compact(make_funnel(1000))], tmp_path / 'funnel')
+    frame = store.to_frame()
+
+    assert is_file_mapped(frame['page_view'].to_numpy())
+    assert is_file_mapped(frame['category'].array.codes)
+    assert not is_file_mapped(frame['date'].to_numpy())
+
+def test_rewrite_replaces_existing_store(tmp_path):
+    path = tmp_path / 'funnel'
+    write_column_store([make_funnel(1000)], path)
+    store = write_column_store([make_funnel(500, seed=1)], path)
+
+    assert ColumnStore(path).rows == store.rows == 500
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['funnel']
+
+def test_partitioned_from_column_store_matches_pandas(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, 'MIN_ROWS_PER_SHARD', 1000)
+    funnel_df = make_funnel(6000).sort_values('date', kind='stable').reset_index(drop=True)
+    store = write_column_store([compact(chunk) for chunk in chunked(funnel_df, 2000)], tmp_path / 'funnel')
+
+    result = PartitionedFunnel.from_column_store(store, group_by=['category'], workers=2)
+
+    daily = funnel_df.groupby('date')[MEASURES].sum()
+    np.testing.assert_array_equal(result.daily_totals[MEASURES].to_numpy(), daily.to_numpy())
+    expected = funnel_df.groupby('category')[MEASURES].sum()
+    totals = result.group_totals['category']
+    assert totals.index.astype(str).tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(totals.to_numpy(), expected.to_numpy())
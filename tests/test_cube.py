@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analyzer import STAGE_COLUMNS
+from src.cube import FunnelCube
+from funnel_data import chunked, compact, make_funnel
+
+MEASURES = list(STAGE_COLUMNS.values())
+
+def test_rollup_matches_pandas_groupby():
+    funnel_df = make_funnel()
+    cube = FunnelCube.from_frame(funnel_df)
+
+    result = cube.rollup(['device_type'], category='Giyim', date=('2024-01-05', '2024-01-20'))
+
+    mask = ((funnel_df['category'] == 'Giyim') & (funnel_df['date'] >= '2024-01-05')
+            & (funnel_df['date'] <= '2024-01-20'))
+    expected = funnel_df[mask].groupby('device_type')[MEASURES].sum()
+    np.testing.assert_array_equal(result[MEASURES].to_numpy(), expected.to_numpy())
+    assert result['device_type'].astype(str).tolist() == expected.index.tolist()
+
+    total = cube.rollup()
+    np.testing.assert_array_equal(total[MEASURES].to_numpy()[0], funnel_df[MEASURES].sum().to_numpy())
+
+def test_from_compact_chunks_matches_from_frame():
+    # Tek gün: küp hücreleri uint8 sınırını (255) aşar
+    funnel_df = make_funnel(20000, days=1)
+
+    streamed = FunnelCube.from_chunks(compact(chunk) for chunk in chunked(funnel_df, 7000))
+    expected = FunnelCube.from_frame(funnel_df)
+
+    pd.testing.assert_frame_equal(streamed.table, expected.table)
+    assert streamed.table['page_view'].max() > 255
+
+def test_from_chunks_without_chunks_is_empty():
+    cube = FunnelCube.from_chunks([])
+    assert len(cube.table) == 0
+    assert list(cube.table.columns) == ['date', 'category', 'device_type', 'source'] + MEASURES
@@ -0,0 +1,84 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.downsample import bin_scatter, lttb, lttb_indices
+
+def reference_lttb(x, y, n_out):
+    """Kova başına Python döngüsüyle klasik LTTB"""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x, avg_y = np.mean(x[avg_start:avg_end]), np.mean(y[avg_start:avg_end])
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+def test_lttb_indices_match_reference():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_007, dtype=float)
+    y = np.cumsum(rng.normal(size=len(x)))
+
+    indices = lttb_indices(x, y, 101)
+
+    np.testing.assert_array_equal(indices, reference_lttb(x, y, 101))
+
+def test_lttb_frame_sorts_dates_and_skips_missing_values():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=3000, freq='h'),
+                       'value': rng.normal(size=3000)})
+    df.loc[::50, 'value'] = np.nan
+
+    result = lttb(df.sample(frac=1, random_state=0), 'date', 'value', 200)
+
+    assert len(result) == 200
+    assert result['date'].is_monotonic_increasing
+    assert result['value'].notna().all()
+    valid = df[df['value'].notna()]
+    assert result['date'].iloc[0] == valid['date'].iloc[0]
+    assert result['date'].iloc[-1] == valid['date'].iloc[-1]
+
+def test_lttb_keeps_short_series():
+    assert lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+
+def test_bin_scatter_matches_pandas_groupby():
+    rng = np.random.default_rng(2)
+    n = 20_000
+    df = pd.DataFrame({
+        'recency_days': rng.exponential(30, n),
+        'monetary': rng.exponential(200, n),
+        'frequency': rng.poisson(3, n) + 1,
+        'segment': rng.choice(['Champions', 'Lost', 'At Risk'], n)
+    })
+    bins = (40, 30)
+
+    result = bin_scatter(df, 'recency_days', 'monetary', group='segment', size='frequency', bins=bins)
+
+    cells = df.assign(
+        x_cell=np.minimum(((df['recency_days'] - df['recency_days'].min())
+                           / (df['recency_days'].max() - df['recency_days'].min()) * bins[0]).astype(int), bins[0] - 1),
+        y_cell=np.minimum(((df['monetary'] - df['monetary'].min())
+                           / (df['monetary'].max() - df['monetary'].min()) * bins[1]).astype(int), bins[1] - 1))
+    expected = cells.groupby(['segment', 'x_cell', 'y_cell']).agg(
+        recency_days=('recency_days', 'mean'), monetary=('monetary', 'mean'),
+        count=('recency_days', 'size'), frequency=('frequency', 'mean')).reset_index()
+
+    assert result['count'].sum() == n
+    assert result['segment'].tolist() == expected['segment'].tolist()
+    for col in ['recency_days', 'monetary', 'frequency']:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy())
+    np.testing.assert_array_equal(result['count'].to_numpy(), expected['count'].to_numpy())
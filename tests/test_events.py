@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analyzer import STAGE_COLUMNS, FunnelAnalyzer
+from src.events import EventFunnelEngine, flags_to_events
+from funnel_data import chunked, make_funnel
+
+STAGES = list(STAGE_COLUMNS.values())
+
+def make_events(n_sessions=400, seed=0):
+    """Karışık sıralı, aşama dışı olaylar da içeren rastgele olay akışı"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 9, n_sessions)
+    sessions = np.repeat(np.arange(1, n_sessions + 1), sizes)
+    starts = pd.Timestamp('2024-03-01') + pd.to_timedelta(rng.integers(0, 10 * 24 * 60, n_sessions), unit='min')
+    return pd.DataFrame({
+        'session_id': sessions,
+        'timestamp': starts.to_numpy()[sessions - 1] + pd.to_timedelta(rng.integers(0, 90, len(sessions)), unit='min').to_numpy(),
+        'event_type': rng.choice(STAGES + ['search'], len(sessions), p=[0.3, 0.25, 0.2, 0.15, 0.1]),
+        'device_type': rng.choice(['Desktop', 'Mobile'], len(sessions))
+    })
+
+def reference_sessionize(events, window=None):
+    """Session başına Python döngüsüyle aynı kurallar"""
+    window = None if window is None else pd.Timedelta(window)
+    ordered = events.sort_values(['session_id', 'timestamp'], kind='stable')
+    rows = []
+    for session_id, group in ordered.groupby('session_id', sort=True):
+        types = group['event_type'].tolist()
+        times = group['timestamp'].tolist()
+        flags = [0] * len(STAGES)
+        start = 0
+        if 'page_view' in types:
+            position = types.index('page_view')
+            start = position
+            flags[0] = 1
+            for j, stage in enumerate(STAGES[1:], start=1):
+                following = [i for i in range(position + 1, len(types)) if types[i] == stage]
+                if not following or (window is not None and times[following[0]] > times[start] + window):
+                    break
+                position = following[0]
+                flags[j] = 1
+        rows.append({'session_id': session_id, 'date': times[start].normalize(),
+                     'device_type': group['device_type'].iloc[start], **dict(zip(STAGES, flags))})
+    return pd.DataFrame(rows)
+
+@pytest.mark.parametrize('window', [None, '30min'])
+def test_sessionize_matches_reference(window):
+    # Karışık sıralı akış; aynı zamanlı olaylar her iki tarafta da aynı (kararlı) sırada kalır
+    events = make_events().sample(frac=1, random_state=0).reset_index(drop=True)
+    engine = EventFunnelEngine(window=window, carry_columns=['device_type'])
+
+    result = engine.sessionize(events)
+    expected = reference_sessionize(events, window)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_chunked_sessionize_matches_whole_stream():
+    events = make_events().sort_values(['session_id', 'timestamp'], kind='stable').reset_index(drop=True)
+    engine = EventFunnelEngine(window='30min')
+
+    whole = engine.sessionize(events)
+    streamed = pd.concat(engine.iter_sessionize(chunked(events, 37)), ignore_index=True)
+
+    pd.testing.assert_frame_equal(streamed, whole)
+    analyzer = engine.funnel_analyzer(chunked(events, 37))
+    assert analyzer.calculate_funnel_stages() == FunnelAnalyzer(whole).calculate_funnel_stages()
+
+def test_flags_round_trip_through_events():
+    funnel_df = make_funnel(1000)
+    funnel_df = funnel_df[funnel_df['page_view'] == 1].reset_index(drop=True)
+
+    events = flags_to_events(funnel_df, carry_columns=['category'])
+    result = EventFunnelEngine(carry_columns=['category']).sessionize(events)
+
+    expected = funnel_df[['session_id', 'date', 'category'] + STAGES]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import parallel
+from src.analyzer import STAGE_COLUMNS
+from src.parallel import PartitionedFunnel, shard_bounds
+from funnel_data import compact, make_funnel
+
+MEASURES = list(STAGE_COLUMNS.values())
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    """Küçük test tablolarında da birden fazla bölüm (ve process) kullanılsın"""
+    monkeypatch.setattr(parallel, 'MIN_ROWS_PER_SHARD', 1000)
+
+def assert_matches_pandas(result, funnel_df, group_by):
+    daily = funnel_df.groupby('date')[MEASURES].sum().reset_index()
+    np.testing.assert_array_equal(result.daily_totals['date'].to_numpy(), daily['date'].to_numpy())
+    np.testing.assert_array_equal(result.daily_totals[MEASURES].to_numpy(), daily[MEASURES].to_numpy())
+    for col in group_by:
+        expected = funnel_df.groupby(col, observed=True)[MEASURES].sum()
+        totals = result.group_totals[col]
+        assert totals.index.astype(str).tolist() == expected.index.astype(str).tolist()
+        np.testing.assert_array_equal(totals.to_numpy(), expected.to_numpy())
+    assert result.rows == len(funnel_df)
+
+@pytest.mark.parametrize('sort_by_date', [True, False])
+def test_from_frame_matches_pandas(small_shards, sort_by_date):
+    funnel_df = make_funnel(8000)
+    if sort_by_date:
+        funnel_df = funnel_df.sort_values('date', kind='stable').reset_index(drop=True)
+
+    result = PartitionedFunnel.from_frame(funnel_df, group_by=['category', 'source'], workers=3)
+
+    assert_matches_pandas(result, funnel_df, ['category', 'source'])
+
+def test_compact_frame_and_analyzers_match_pandas(small_shards):
+    funnel_df = make_funnel(8000, days=3)
+
+    result = PartitionedFunnel.from_frame(compact(funnel_df), group_by=['device_type'], workers=2)
+
+    assert_matches_pandas(result, funnel_df, ['device_type'])
+    stages = result.funnel_analyzer().calculate_funnel_stages()
+    assert list(stages.values()) == funnel_df[MEASURES].sum().tolist()
+
+def test_shard_bounds_cover_rows_and_align_to_days():
+    days = np.repeat(np.arange(10), 37)
+    bounds = shard_bounds(days, 4)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(days)
+    assert all(stop == start for (_, stop), (start, _) in zip(bounds[:-1], bounds[1:]))
+    assert all(days[start] != days[start - 1] for start, _ in bounds[1:])
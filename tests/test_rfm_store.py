@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analyzer import RFMAnalyzer
+from src.rfm_store import RFMStateStore
+
+AS_OF = pd.Timestamp('2024-12-31')
+
+def reference_segment(recency, frequency, monetary):
+    """create_rfm_data'daki if/elif kuralları"""
+    if recency <= 30 and frequency >= 3 and monetary >= 200:
+        return 'Champions'
+    elif recency <= 60 and frequency >= 2:
+        return 'Loyal Customers'
+    elif recency <= 90:
+        return 'At Risk'
+    return 'Lost'
+
+def make_rfm(n_customers=400, seed=0):
+    rng = np.random.default_rng(seed)
+    recency = rng.exponential(30, n_customers).astype(np.int64)
+    df = pd.DataFrame({
+        'customer_id': [f"customer_{i + 1}" for i in range(n_customers)],
+        'recency_days': recency,
+        'frequency': rng.poisson(3, n_customers) + 1,
+        'monetary': rng.exponential(200, n_customers),
+        'last_purchase_date': AS_OF - pd.to_timedelta(recency, unit='D')
+    })
+    df['segment'] = [reference_segment(*row) for row in df[['recency_days', 'frequency', 'monetary']].itertuples(index=False)]
+    return df
+
+def make_orders(n_orders=1500, seed=1):
+    rng = np.random.default_rng(seed)
+    # Mevcut ve yeni müşteriler karışık; aynı müşteri birden fazla sipariş verebilir
+    return pd.DataFrame({
+        'customer_id': [f"customer_{i}" for i in rng.integers(300, 600, n_orders)],
+        'order_date': AS_OF + pd.to_timedelta(rng.integers(1, 45, n_orders), unit='D'),
+        'total_amount': rng.uniform(20, 500, n_orders).round(2)
+    })
+
+def recompute(rfm_df, orders):
+    """Baştan hesaplama: eski durum + siparişler, müşteri bazında pandas ile"""
+    history = pd.concat([
+        rfm_df[['customer_id', 'last_purchase_date', 'frequency', 'monetary']],
+        orders.rename(columns={'order_date': 'last_purchase_date', 'total_amount': 'monetary'}).assign(frequency=1)
+    ])
+    state = history.groupby('customer_id').agg(last_purchase_date=('last_purchase_date', 'max'),
+                                                frequency=('frequency', 'sum'),
+                                                monetary=('monetary', 'sum'))
+    as_of = orders['order_date'].max()
+    state['recency_days'] = (as_of - state['last_purchase_date']).dt.days
+    state['segment'] = [reference_segment(*row) for row in
+                        state[['recency_days', 'frequency', 'monetary']].itertuples(index=False)]
+    return state
+
+def test_from_rfm_frame_reproduces_input():
+    rfm_df = make_rfm()
+    store = RFMStateStore.from_rfm_frame(rfm_df)
+
+    result = store.to_frame()
+    assert result['customer_id'].tolist() == rfm_df['customer_id'].tolist()
+    np.testing.assert_array_equal(result['recency_days'], rfm_df['recency_days'])
+    assert result['segment'].astype(str).tolist() == rfm_df['segment'].tolist()
+
+def test_ingest_matches_full_recompute():
+    rfm_df = make_rfm()
+    orders = make_orders()
+    store = RFMStateStore.from_rfm_frame(rfm_df)
+
+    for part in np.array_split(np.arange(len(orders)), 3):
+        store.ingest(orders.iloc[part])
+    store.rescore_all(refresh_edges=False)
+
+    expected = recompute(rfm_df, orders)
+    result = store.to_frame().set_index('customer_id').loc[expected.index]
+    assert len(store) == len(expected)
+    np.testing.assert_array_equal(result['frequency'], expected['frequency'])
+    np.testing.assert_allclose(result['monetary'], expected['monetary'])
+    np.testing.assert_array_equal(result['recency_days'], expected['recency_days'])
+    assert result['segment'].astype(str).tolist() == expected['segment'].tolist()
+    assert store.get_segment('customer_450') == expected.loc['customer_450', 'segment']
+
+def test_rfm_codes_match_rfm_analyzer():
+    rfm_df = make_rfm()
+    store = RFMStateStore.from_rfm_frame(rfm_df)
+    store.ingest(make_orders())
+    store.rescore_all()
+
+    state = store.to_frame()
+    scored = RFMAnalyzer(state).calculate_rfm_scores()
+    expected = scored['RFM_score'].astype(str).astype(int)
+    np.testing.assert_array_equal(state['RFM_code'], expected)
+
+def test_ingest_reports_changed_segments():
+    store = RFMStateStore.from_rfm_frame(make_rfm())
+    before = store.to_frame().set_index('customer_id')['segment'].astype(str)
+
+    changes = store.ingest(make_orders())
+
+    after = store.to_frame().set_index('customer_id')['segment'].astype(str)
+    touched = make_orders()['customer_id'].unique()
+    existing = [c for c in touched if c in before.index]
+    changed = [c for c in existing if before[c] != after[c]]
+    new = [c for c in touched if c not in before.index]
+    assert sorted(changes['customer_id']) == sorted(changed + new)
+
+def test_ingesting_known_customers_does_not_grow_capacity():
+    rfm_df = make_rfm()
+    store = RFMStateStore.from_rfm_frame(rfm_df)
+    capacity = len(store._ids)
+
+    orders = pd.DataFrame({'customer_id': np.repeat(rfm_df['customer_id'].to_numpy(), 10),
+                           'order_date': AS_OF, 'total_amount': 10.0})
+    store.ingest(orders)
+
+    assert len(store._ids) == capacity
+    assert len(store) == len(rfm_df)
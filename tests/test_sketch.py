@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analyzer import RFMAnalyzer
+from src.sketch import QuantileSketch, RFMSketch
+
+QS = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+def rank_errors(sketch, values):
+    """Sketch quantile'larının normalize rank hatası (kesin sıralamaya göre)"""
+    ordered = np.sort(values)
+    estimates = sketch.quantiles(QS)
+    low = np.searchsorted(ordered, estimates, side='left') / len(ordered)
+    high = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    # Tekrar eden değerlerde rank bir aralıktır; q'ya en yakın ucu alınır
+    return np.maximum(0, np.maximum(low - QS, np.array(QS) - high))
+
+@pytest.mark.parametrize('epsilon', [0.05, 0.01])
+def test_streamed_quantiles_within_rank_error(epsilon):
+    values = np.random.default_rng(1).exponential(200, 200_000)
+    sketch = QuantileSketch.from_error(epsilon, seed=0)
+    for start in range(0, len(values), 10_000):
+        sketch.update(values[start:start + 10_000])
+
+    assert sketch.count == len(values)
+    assert rank_errors(sketch, values).max() <= epsilon
+    assert sum(len(level) for level in sketch.levels) < len(values) / 10
+
+def test_merged_sketches_within_rank_error():
+    rng = np.random.default_rng(2)
+    parts = [rng.poisson(3, 50_000).astype(float), rng.exponential(30, 80_000), rng.uniform(0, 90, 30_000)]
+    sketches = [QuantileSketch.from_error(0.01, seed=i).update(part) for i, part in enumerate(parts)]
+    merged = sketches[0].merge(sketches[1]).merge(sketches[2])
+
+    assert rank_errors(merged, np.concatenate(parts)).max() <= 0.01
+
+def test_extreme_quantiles_are_exact_min_and_max():
+    values = np.random.default_rng(3).normal(size=30_000)
+    sketch = QuantileSketch(k=50, seed=0).update(values)
+    assert sketch.quantiles([0, 1]).tolist() == [values.min(), values.max()]
+
+def test_nan_values_are_ignored():
+    sketch = QuantileSketch(seed=0).update([1.0, np.nan, 3.0])
+    assert sketch.count == 2
+
+def test_sketch_edges_score_like_exact_quartiles():
+    rng = np.random.default_rng(4)
+    n = 100_000
+    rfm_df = pd.DataFrame({
+        'customer_id': np.arange(n),
+        'recency_days': rng.exponential(30, n),
+        'frequency': rng.poisson(3, n) + 1,
+        'monetary': rng.exponential(200, n)
+    })
+    sketch = RFMSketch(0.01, seed=0)
+    for start in range(0, n, 20_000):
+        sketch.update(rfm_df.iloc[start:start + 20_000])
+
+    analyzer = RFMAnalyzer(rfm_df)
+    exact = analyzer.calculate_rfm_scores()
+    approximate = analyzer.calculate_rfm_scores(edges=sketch.quartile_edges())
+
+    # Sadece quartile sınırına rank hatası kadar yakın müşteriler kutu değiştirebilir
+    for score in ['R_score', 'F_score', 'M_score']:
+        assert (exact[score] != approximate[score]).mean() <= 3 * 0.01
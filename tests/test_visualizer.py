@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.visualizer import optimize_figure
+
+def test_optimize_figure_converts_large_scatter_to_webgl():
+    x = np.arange(6000)
+    fig = go.Figure(go.Scatter(x=x, y=x * 2.0, mode='markers', cliponaxis=False))
+    fig.update_layout(title="Büyük scatter")
+
+    optimized = optimize_figure(fig)
+
+    assert [trace.type for trace in optimized.data] == ['scattergl']
+    assert optimized.layout.title.text == "Büyük scatter"
+    np.testing.assert_array_equal(optimized.data[0].x, x)
+    np.testing.assert_array_equal(optimized.data[0].y, x * 2.0)
+
+def test_optimize_figure_keeps_small_scatter_and_dates():
+    dates = pd.date_range('2024-01-01', periods=10).to_numpy()
+    fig = go.Figure(go.Scatter(x=dates, y=np.arange(10.0)))
+
+    optimized = optimize_figure(fig)
+
+    assert optimized.data[0].type == 'scatter'
+    assert optimized.layout.xaxis.type == 'date'
+    assert optimized.data[0].x[0] == dates[0].astype('datetime64[ms]').astype(np.int64)
+
+def test_export_static_without_kaleido_raises_clear_error(tmp_path, monkeypatch):
+    import importlib.util
+    from src.visualizer import export_static
+
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec',
+                        lambda name, *args: None if name == 'kaleido' else real_find_spec(name, *args))
+    with pytest.raises(ImportError, match="kaleido"):
+        export_static(go.Figure(), tmp_path / "figure.png")